@@ -0,0 +1,66 @@
+"""Awaitable wrappers around database.py for use from handlers.
+
+Every call runs on a small dedicated thread pool, so a slow query or a
+locked database file never blocks the asyncio event loop.
+"""
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+import database
+import tracing
+from metrics import metrics, DB_DURATION, DB_ERRORS
+
+# Один поток на каждое соединение пула (читатели + писатель)
+_executor = ThreadPoolExecutor(
+    max_workers=database.DB_READERS + 1,
+    thread_name_prefix="db"
+)
+
+def _to_async(func):
+    """Wrap a blocking database function into a coroutine function."""
+    name = func.__name__
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        loop = asyncio.get_running_loop()
+        call = functools.partial(func, *args, **kwargs)
+        with metrics.timer(DB_DURATION, name, errors=DB_ERRORS), tracing.span(f"db {name}"):
+            if tracing.active():
+                # run_in_executor не переносит contextvars - передаём текущий спан в поток явно
+                call = functools.partial(contextvars.copy_context().run, call)
+            return await loop.run_in_executor(_executor, call)
+    return wrapper
+
+def shutdown():
+    """Wait for queued database calls and stop the worker threads."""
+    _executor.shutdown(wait=True)
+
+checkpoint_wal = _to_async(database.checkpoint_wal)
+
+# List sections (sections.py)
+get_section_items = _to_async(database.get_section_items)
+get_section_item = _to_async(database.get_section_item)
+add_section_item = _to_async(database.add_section_item)
+update_section_item = _to_async(database.update_section_item)
+set_section_item_status = _to_async(database.set_section_item_status)
+delete_section_item = _to_async(database.delete_section_item)
+get_random_section_item = _to_async(database.get_random_section_item)
+get_section_top = _to_async(database.get_section_top)
+get_section_categories = _to_async(database.get_section_categories)
+get_section_category_by_name = _to_async(database.get_section_category_by_name)
+add_section_category = _to_async(database.add_section_category)
+
+# Video cache
+save_section_media = _to_async(database.save_section_media)
+get_section_media_to_check = _to_async(database.get_section_media_to_check)
+set_section_media_status = _to_async(database.set_section_media_status)
+
+# Search
+search = _to_async(database.search)
+
+# Bot state persistence
+get_persisted_user_data = _to_async(database.get_persisted_user_data)
+get_persisted_conversations = _to_async(database.get_persisted_conversations)
+save_persisted_state = _to_async(database.save_persisted_state)
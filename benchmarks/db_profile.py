@@ -0,0 +1,111 @@
+"""Write-latency benchmark: SQLite defaults vs the tuned connection profile.
+
+Usage:
+    python benchmarks/db_profile.py [--writes 500] [--readers 2]
+
+Each profile gets a fresh database file. The writer thread performs
+single-row INSERT + COMMIT (the pattern used by add_section_item/set_section_item_status)
+while reader threads keep scanning the table, which is what two users
+tapping at the same time look like.
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from db_pool import ConnectionPool  # noqa: E402
+
+PROFILES = {
+    # Значения SQLite по умолчанию (rollback journal, synchronous=FULL)
+    "defaults": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "cache_size": -2000,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,
+    },
+    "tuned": {},
+}
+
+def percentile(values, pct):
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def run_profile(name, pragmas, writes, readers):
+    """Run the workload for one profile and return latency stats in ms."""
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = ConnectionPool(Path(tmp) / "bench.db", readers=readers, pragmas=pragmas)
+        with pool.writer() as conn:
+            conn.execute("""
+                CREATE TABLE movies (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    title TEXT NOT NULL,
+                    watched INTEGER DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+        stop = threading.Event()
+        errors = []
+
+        def reader_loop():
+            while not stop.is_set():
+                try:
+                    with pool.reader() as conn:
+                        conn.execute("SELECT * FROM movies ORDER BY created_at DESC").fetchall()
+                except Exception as e:
+                    errors.append(e)
+
+        threads = [threading.Thread(target=reader_loop) for _ in range(readers)]
+        for thread in threads:
+            thread.start()
+
+        latencies = []
+        try:
+            for i in range(writes):
+                started = time.perf_counter()
+                try:
+                    with pool.writer() as conn:
+                        conn.execute("INSERT INTO movies (title) VALUES (?)", (f"Movie {i}",))
+                except Exception as e:
+                    errors.append(e)
+                    continue
+                latencies.append((time.perf_counter() - started) * 1000)
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            pool.close()
+
+    return {
+        "profile": name,
+        "writes": len(latencies),
+        "errors": len(errors),
+        "mean": statistics.mean(latencies) if latencies else 0.0,
+        "p50": percentile(latencies, 50) if latencies else 0.0,
+        "p99": percentile(latencies, 99) if latencies else 0.0,
+        "max": max(latencies) if latencies else 0.0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writes", type=int, default=500)
+    parser.add_argument("--readers", type=int, default=2)
+    args = parser.parse_args()
+
+    print(f"{'profile':<10} {'writes':>7} {'errors':>7} {'mean ms':>9} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, pragmas in PROFILES.items():
+        r = run_profile(name, pragmas, args.writes, args.readers)
+        print(f"{r['profile']:<10} {r['writes']:>7} {r['errors']:>7} {r['mean']:>9.3f} "
+              f"{r['p50']:>9.3f} {r['p99']:>9.3f} {r['max']:>9.3f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,319 @@
+"""End-to-end replay benchmark of the handler stack.
+
+Usage:
+    python benchmarks/replay.py [--iterations 200] [--items 300] [--output replay.json]
+                                [--compare previous.json] [--replay updates.jsonl]
+
+Builds the real Application (bot.build_application, every handler and
+route registered) on a fresh database in a temporary DATA_DIR, with a
+fake Bot API that answers every call in memory, and feeds it synthetic
+updates from two users of a temporary config.json (CONFIG_FILE) written
+next to the database:
+
+    browse  - lists of movies, games and activities, a second page, tops
+    detail  - opening a movie, a game and an activity
+    add     - the movie add dialog: button, title, /skip, category
+    rate    - marking a movie watched and the two-step rating
+
+Each update goes through the update processor like a polled one, so the
+numbers include persistence, the callback router, the rate limiter (with
+its limits lifted) and the database thread pool. Per flow the script
+reports throughput, p50/p99 latency per update and the number of
+updates whose handler raised, writes them as JSON and, with --compare,
+prints the change against an earlier run. The script exits non-zero if
+any handler raised.
+
+--replay adds recorded updates (one Update JSON per line, optional
+"flow" key to group them) as extra flows.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from db_profile import percentile
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# Без настоящего токена: запросы к Bot API не выходят из процесса
+os.environ.setdefault("BOT_TOKEN", "123:abc")
+
+FLOWS = ("browse", "detail", "add", "rate")
+# Пользователи временного config.json, от их имени отправляются обновления
+BENCH_USERS = (
+    {"telegram_id": 1001, "display_name": "Bench 1"},
+    {"telegram_id": 1002, "display_name": "Bench 2"},
+)
+
+class UpdateFactory:
+    """Synthetic updates from one user in their private chat."""
+
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self.update_ids = itertools.count(1)
+        self.message_ids = itertools.count(1)
+        self.user = {"id": user_id, "is_bot": False, "first_name": "Bench"}
+        self.chat = {"id": user_id, "type": "private"}
+
+    def text(self, text: str) -> dict:
+        message = {
+            "message_id": next(self.message_ids), "date": int(time.time()),
+            "chat": self.chat, "from": self.user, "text": text,
+        }
+        if text.startswith("/"):
+            message["entities"] = [{"type": "bot_command", "offset": 0, "length": len(text.split()[0])}]
+        return {"update_id": next(self.update_ids), "message": message}
+
+    def button(self, data: str) -> dict:
+        message = {
+            "message_id": 1, "date": int(time.time()), "chat": self.chat,
+            "from": {"id": 1, "is_bot": True, "first_name": "Bot"}, "text": "menu",
+        }
+        update_id = next(self.update_ids)
+        return {
+            "update_id": update_id,
+            "callback_query": {
+                "id": str(update_id), "from": self.user, "chat_instance": "bench",
+                "data": data, "message": message,
+            },
+        }
+
+def seed(database, items: int) -> Dict[str, List[int]]:
+    """Fill the fresh database; returns the ids used by the flows."""
+    categories = [row['id'] for row in database.get_section_categories("movies")]
+    movies, watched = [], []
+    for i in range(items):
+        movie_id = database.add_section_item("movies", {
+            "title": f"Movie {i}", "note": "note" if i % 3 else None, "category_id": categories[i % len(categories)],
+        })
+        if i % 4 == 0:
+            database.set_section_item_status("movies", movie_id, 1, i % 10 + 1, (i * 7) % 10 + 1)
+            watched.append(movie_id)
+        else:
+            movies.append(movie_id)
+    games = []
+    for i in range(items // 2):
+        games.append(database.add_section_item("games", {"title": f"Game {i}", "genre": ("RPG", "Puzzle", "Shooter")[i % 3]}))
+        if i % 3 == 0:
+            database.set_section_item_status("games", games[-1], "done", i % 10 + 1, i % 10 + 1)
+    activities = [database.add_section_item("activities", {"title": f"Activity {i}"}) for i in range(items // 4)]
+    return {"movies": movies, "games": games, "activities": activities}
+
+def build_flows(users: Tuple[UpdateFactory, UpdateFactory], ids: Dict[str, List[int]],
+                iterations: int) -> Dict[str, List[List[dict]]]:
+    """Per flow, the updates of each iteration (an iteration runs one scenario)."""
+    first, second = users
+    movies, games, activities = ids["movies"], ids["games"], ids["activities"]
+    flows: Dict[str, List[List[dict]]] = {name: [] for name in FLOWS}
+    for i in range(iterations):
+        user = users[i % 2]
+        flows["browse"].append([
+            user.button("movies:pending:all"),
+            user.button("movies:pending:all:page:1"),
+            user.button("movies:watched:all"),
+            user.button("movies:top:all"),
+            user.button("games:pending:all"),
+            user.button("activities:planned"),
+        ])
+        flows["detail"].append([
+            user.button(f"movie:{movies[i % len(movies)]}"),
+            user.button(f"game:{games[i % len(games)]}"),
+            user.button(f"activity:{activities[i % len(activities)]}"),
+        ])
+        flows["add"].append([
+            first.button("movies:add"),
+            first.text(f"Bench movie {i}"),
+            first.text("/skip"),
+            first.button("movie_add:cat:1"),
+        ])
+        # Каждая итерация оценивает ещё не просмотренный фильм
+        movie_id = movies[-1 - i % len(movies)]
+        flows["rate"].append([
+            second.button(f"movie:{movie_id}:watched"),
+            second.button(f"movie:{movie_id}:rate:1:{i % 10 + 1}"),
+            second.button(f"movie:{movie_id}:rate:2:{(i * 3) % 10 + 1}"),
+        ])
+    return flows
+
+def load_replay(path: Path) -> Dict[str, List[List[dict]]]:
+    """Recorded updates grouped by their "flow" key, one update per iteration."""
+    flows: Dict[str, List[List[dict]]] = defaultdict(list)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                data = json.loads(line)
+                flows[f"replay:{data.pop('flow', 'recorded')}"].append([data])
+    return dict(flows)
+
+async def run_flows(flows: Dict[str, List[List[dict]]], warmup: int) -> Dict[str, dict]:
+    # bot импортируется после того, как DATA_DIR указывает на временный каталог
+    import bot
+    from telegram import Update
+    from telegram.request import BaseRequest
+    from rate_limiter import OutboundRateLimiter
+
+    class CapturingRequest(BaseRequest):
+        """Fake Bot API: answers in memory and counts calls per method."""
+
+        def __init__(self):
+            self.calls: Dict[str, int] = defaultdict(int)
+            self.message_ids = itertools.count(1000)
+
+        async def initialize(self):
+            pass
+
+        async def shutdown(self):
+            pass
+
+        async def do_request(self, url, method, request_data=None, read_timeout=None,
+                             write_timeout=None, connect_timeout=None, pool_timeout=None):
+            endpoint = url.rsplit("/", 1)[-1]
+            self.calls[endpoint] += 1
+            params = request_data.parameters if request_data else {}
+            if endpoint == "getMe":
+                result = {"id": 1, "is_bot": True, "first_name": "Bench", "username": "bench_bot"}
+            elif endpoint.startswith(("send", "edit")):
+                result = {
+                    "message_id": next(self.message_ids), "date": int(time.time()),
+                    "chat": {"id": params.get("chat_id", 1), "type": "private"},
+                    "text": params.get("text", ""),
+                }
+            else:
+                result = True
+            return 200, json.dumps({"ok": True, "result": result}).encode()
+
+    request = CapturingRequest()
+    unlimited = OutboundRateLimiter(global_rate=1e9, chat_rate=1e9, chat_burst=1e9)
+    app = bot.build_application(request=request, rate_limiter=unlimited)
+    # Без обработчика ошибок PTB только пишет исключение в лог, и упавшее
+    # обновление выглядело бы быстрым: исключения считаются по сценариям
+    errors: Dict[str, int] = defaultdict(int)
+    flow = None
+
+    async def count_error(update: object, context):
+        errors[flow] += 1
+        logging.getLogger(__name__).error(f"Update in flow {flow} raised", exc_info=context.error)
+
+    app.add_error_handler(count_error)
+    await app.initialize()
+
+    async def process(data: dict) -> float:
+        update = Update.de_json(data, app.bot)
+        started = time.perf_counter()
+        await app.update_processor.process_update(update, app.process_update(update))
+        return time.perf_counter() - started
+
+    results = {}
+    try:
+        for name, iterations in flows.items():
+            flow = name
+            for updates in iterations[:warmup]:
+                for data in updates:
+                    await process(data)
+            measured = iterations[warmup:]
+            calls_before = sum(request.calls.values())
+            latencies = []
+            started = time.perf_counter()
+            for updates in measured:
+                for data in updates:
+                    latencies.append(await process(data) * 1000)
+            elapsed = time.perf_counter() - started
+            if not latencies:
+                continue
+            results[name] = {
+                # Вместе с прогревом: любое исключение делает замер недействительным
+                "errors": errors[name],
+                "iterations": len(measured),
+                "updates": len(latencies),
+                "seconds": round(elapsed, 4),
+                "updates_per_second": round(len(latencies) / elapsed, 1),
+                "mean_ms": round(statistics.mean(latencies), 3),
+                "p50_ms": round(percentile(latencies, 50), 3),
+                "p99_ms": round(percentile(latencies, 99), 3),
+                "max_ms": round(max(latencies), 3),
+                "api_calls_per_update": round((sum(request.calls.values()) - calls_before) / len(latencies), 2),
+            }
+    finally:
+        await app.shutdown()
+        await bot.post_shutdown(app)
+    return results
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def print_results(results: Dict[str, dict], baseline: Dict[str, dict]):
+    print(f"{'flow':<18} {'updates':>8} {'upd/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'calls/upd':>10} {'errors':>7}")
+    for name, r in results.items():
+        line = (f"{name:<18} {r['updates']:>8} {r['updates_per_second']:>9.1f} {r['p50_ms']:>9.3f} "
+                f"{r['p99_ms']:>9.3f} {r['api_calls_per_update']:>10.2f} {r['errors']:>7}")
+        before = baseline.get(name)
+        if before:
+            changes = [
+                f"{key.split('_')[0]} {(r[key] - before[key]) / before[key] * 100:+.0f}%"
+                for key in ("p50_ms", "p99_ms") if before.get(key)
+            ]
+            line += "   " + ", ".join(changes)
+        print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200, help="scenarios per flow")
+    parser.add_argument("--warmup", type=int, default=10, help="scenarios per flow run before measuring")
+    parser.add_argument("--items", type=int, default=300, help="movies seeded (games 1/2, activities 1/4)")
+    parser.add_argument("--output", type=Path, default=Path("replay.json"))
+    parser.add_argument("--compare", type=Path, help="earlier --output to compare against")
+    parser.add_argument("--replay", type=Path, help="recorded updates, one JSON per line")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATA_DIR"] = tmp
+        # Свой список пользователей: настоящий config.json не нужен и не читается
+        config_file = Path(tmp) / "config.json"
+        config_file.write_text(json.dumps({"users": BENCH_USERS}), encoding="utf-8")
+        os.environ["CONFIG_FILE"] = str(config_file)
+        import database
+        from config import USER_IDS
+
+        database.init_database()
+        ids = seed(database, args.items)
+        users = (UpdateFactory(USER_IDS[0]), UpdateFactory(USER_IDS[1]))
+        total = args.warmup + args.iterations
+        flows = build_flows(users, ids, total)
+        if args.replay:
+            flows.update(load_replay(args.replay))
+        results = asyncio.run(run_flows(flows, args.warmup))
+
+    report = {
+        "revision": git_revision(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "iterations": args.iterations,
+        "items": args.items,
+        "flows": results,
+    }
+    args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    baseline = json.loads(args.compare.read_text(encoding="utf-8"))["flows"] if args.compare else {}
+    print_results(results, baseline)
+    print(f"\nSaved to {args.output}")
+    failed = sum(r['errors'] for r in results.values())
+    if failed:
+        sys.exit(f"{failed} update(s) raised an exception, the numbers above are not valid")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""Fake Telegram for testing webhook mode locally.
+
+Usage:
+    # 1. fake Bot API + client (start first, it waits for the bot)
+    python benchmarks/webhook_client.py --secret test --user-id 123456789 [--updates 100]
+
+    # 2. the bot, pointed at the fake Bot API
+    BOT_TOKEN=123:abc BOT_MODE=webhook WEBHOOK_SECRET=test \\
+        TELEGRAM_API_URL=http://127.0.0.1:8081/bot python bot.py
+
+The script answers every Bot API method with a plausible result, waits for
+/health, checks that a wrong secret is rejected, then posts /start updates
+one by one. For each update it measures the webhook response time and the
+time until the bot makes its reply call.
+"""
+import argparse
+import asyncio
+import itertools
+import statistics
+import time
+
+from aiohttp import ClientSession, web
+
+from db_profile import percentile
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+class FakeBotApi:
+    """Answers Bot API calls and signals each one to the waiting client."""
+
+    def __init__(self):
+        self.calls = asyncio.Queue()
+        self.message_ids = itertools.count(1)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        method = request.match_info['method']
+        if method == "getMe":
+            result = {"id": 1, "is_bot": True, "first_name": "Fake", "username": "fake_bot"}
+        elif method.startswith(("send", "edit")):
+            result = {
+                "message_id": next(self.message_ids), "date": int(time.time()),
+                "chat": {"id": 1, "type": "private"}, "text": "",
+            }
+        else:
+            result = True
+        await self.calls.put((method, time.perf_counter()))
+        return web.json_response({"ok": True, "result": result})
+
+def make_update(update_id: int, user_id: int) -> dict:
+    """A private /start message from ``user_id``."""
+    user = {"id": user_id, "is_bot": False, "first_name": "Test"}
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id, "date": int(time.time()),
+            "chat": {"id": user_id, "type": "private"}, "from": user,
+            "text": "/start", "entities": [{"type": "bot_command", "offset": 0, "length": 6}],
+        },
+    }
+
+async def wait_healthy(session: ClientSession, base: str, timeout: float = 60):
+    """Poll /health until the bot reports ok."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            async with session.get(f"{base}/health") as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            pass
+        await asyncio.sleep(0.5)
+    raise TimeoutError("bot did not become healthy")
+
+async def run(args):
+    api = FakeBotApi()
+    api_app = web.Application()
+    api_app.router.add_post("/bot{token}/{method}", api.handle)
+    runner = web.AppRunner(api_app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", args.api_port).start()
+    print(f"Fake Bot API on http://127.0.0.1:{args.api_port}/bot, waiting for the bot...")
+
+    base = f"http://127.0.0.1:{args.port}"
+    url = f"{base}{args.path}"
+    ack, reply = [], []
+    async with ClientSession() as session:
+        await wait_healthy(session, base)
+
+        async with session.post(url, json=make_update(1, args.user_id),
+                                headers={SECRET_HEADER: "wrong"}) as response:
+            print(f"wrong secret -> HTTP {response.status}")
+
+        for update_id in range(2, args.updates + 2):
+            while not api.calls.empty():
+                api.calls.get_nowait()
+            started = time.perf_counter()
+            async with session.post(url, json=make_update(update_id, args.user_id),
+                                    headers={SECRET_HEADER: args.secret}) as response:
+                response.raise_for_status()
+            ack.append((time.perf_counter() - started) * 1000)
+            _, called_at = await asyncio.wait_for(api.calls.get(), timeout=10)
+            reply.append((called_at - started) * 1000)
+
+        async with session.get(f"{base}/health") as response:
+            print(f"health -> HTTP {response.status} {await response.json()}")
+    await runner.cleanup()
+
+    print(f"{'metric':<10} {'n':>5} {'mean ms':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    for name, values in (("ack", ack), ("reply", reply)):
+        print(f"{name:<10} {len(values):>5} {statistics.mean(values):>9.2f} "
+              f"{percentile(values, 50):>9.2f} {percentile(values, 99):>9.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--secret", required=True)
+    parser.add_argument("--user-id", type=int, required=True, help="authorized telegram_id from config.json")
+    parser.add_argument("--updates", type=int, default=100)
+    parser.add_argument("--port", type=int, default=8080, help="WEBHOOK_PORT of the bot")
+    parser.add_argument("--path", default="/telegram", help="WEBHOOK_PATH of the bot")
+    parser.add_argument("--api-port", type=int, default=8081)
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == '__main__':
+    main()
@@ -1,22 +1,45 @@
 """Main bot file."""
 # Telegram Multi-List Bot - Main entry point
+import asyncio
+import time
+
+# Отсчёт времени запуска начинается до тяжёлых импортов
+STARTED_AT = time.perf_counter()
+
 import logging
+from typing import Optional
 from telegram import Update
-from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, filters
-from config import BOT_TOKEN, is_authorized_user
+from telegram.ext import (
+    Application, ApplicationHandlerStop, BaseHandler, CommandHandler, MessageHandler,
+    CallbackQueryHandler, ConversationHandler, InlineQueryHandler, TypeHandler
+)
+from config import (
+    BOT_TOKEN, DB_CHECKPOINT_INTERVAL, is_authorized_user, BOT_MODE, TELEGRAM_API_URL,
+    WEBHOOK_URL, WEBHOOK_SECRET, WEBHOOK_LISTEN, WEBHOOK_PORT, WEBHOOK_PATH,
+    METRICS_LISTEN, METRICS_PORT
+)
 
 # Maintenance: no-op touch to keep file metadata current (2025-11-20).
-from database import init_database
-from keyboards import main_menu_keyboard, main_menu_inline_keyboard
+import async_database
+import tracing
+from database import init_database, close_database, get_category_cache_stats
+from keyboards import main_menu_keyboard, main_menu_inline_keyboard, registry as keyboard_registry
+from webhook import run_webhook
+from update_processor import ChatUpdateProcessor
+from persistence import SQLitePersistence
+from rate_limiter import OutboundRateLimiter
+from metrics import (
+    metrics, instrument_application, format_summary, start_metrics_server,
+    KEYBOARDS_BUILT, KEYBOARDS_REUSED, KEYBOARDS_CACHED, CATEGORY_CACHE_HITS, CATEGORY_CACHE_MISSES
+)
+from query_stats import query_stats, format_top
 
 # Import all handlers
-from handlers.movies import get_movies_handlers
-from handlers.activities import get_activities_handlers
-from handlers.trips import get_trips_handlers
-from handlers.tiktok import get_tiktok_handlers
-from handlers.photos import get_photos_handlers
-from handlers.games import get_games_handlers
-from handlers.sexual import get_sexual_handlers
+from callback_router import CallbackRouter, Route
+from handlers.search import get_search_handlers
+from handlers.sections import (
+    get_section_handlers, get_section_routes, section_menus, media_check_job, MEDIA_CHECK_INTERVAL
+)
 
 # Configure logging
 logging.basicConfig(
@@ -25,19 +48,39 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Сколько обновлений разных чатов обрабатываются одновременно
+MAX_CONCURRENT_UPDATES = 8
+
+async def auth_gate(update: Update, context):
+    """Stop updates from users not listed in config.json before any other handler runs."""
+    user = update.effective_user
+    if user and is_authorized_user(user.id):
+        return
+    message = update.message
+    if message and message.text and message.text.startswith("/start"):
+        await message.reply_text("❌ У вас нет доступа к этому боту.")
+    raise ApplicationHandlerStop
+
 async def start(update: Update, context):
     """Handle /start command."""
-    user_id = update.effective_user.id
-    
-    if not is_authorized_user(user_id):
-        await update.message.reply_text("❌ У вас нет доступа к этому боту.")
-        return
-    
     await update.message.reply_text(
         "👋 Добро пожаловать!\n\nВыберите раздел:",
         reply_markup=main_menu_keyboard()
     )
 
+async def metrics_command(update: Update, context):
+    """Show handler, update and database latency percentiles."""
+    await update.message.reply_text(format_summary())
+
+async def queries_command(update: Update, context):
+    """Show the most expensive database statements; ``/queries reset`` starts over."""
+    if context.args and context.args[0] == "reset":
+        query_stats.reset()
+        await update.message.reply_text("✅ Статистика запросов сброшена")
+        return
+    for text in format_top():
+        await update.message.reply_text(text)
+
 async def main_menu(update: Update, context):
     """Handle main menu callback."""
     query = update.callback_query
@@ -60,79 +103,183 @@ async def section_handler(update: Update, context):
     
     section = query.data.split(":")[1]
     
-    # Импортируем функции меню
-    from handlers.movies import movies_menu
-    from handlers.activities import activities_menu
-    from handlers.trips import trips_menu
-    from handlers.tiktok import tiktok_menu
-    from handlers.photos import photos_menu
-    from handlers.games import games_menu
-    from handlers.sexual import sexual_menu
-    
-    handlers_map = {
-        "movies": movies_menu,
-        "activities": activities_menu,
-        "trips": trips_menu,
-        "tiktok": tiktok_menu,
-        "photos": photos_menu,
-        "games": games_menu,
-        "sexual": sexual_menu
-    }
+    # Все разделы описаны в sections.py
+    handlers_map = section_menus()
     
     if section in handlers_map:
         # Вызываем соответствующий обработчик меню
         # Он должен обработать callback_query
         await handlers_map[section](update, context)
 
-async def unauthorized(update: Update, context):
-    """Handle unauthorized users."""
-    user_id = update.effective_user.id
-    if not is_authorized_user(user_id):
-        await update.message.reply_text("❌ У вас нет доступа к этому боту.")
-        return False
-    return True
+async def wal_checkpoint_job(context):
+    """Periodically move WAL pages back into the database file."""
+    result = await async_database.checkpoint_wal()
+    if result:
+        logger.debug(f"WAL checkpoint: busy={result[0]} log={result[1]} checkpointed={result[2]}")
 
-def main():
-    """Start the bot."""
-    # Initialize database
-    init_database()
+async def post_init(application: Application):
+    """Log how long startup took once the bot is connected to Telegram."""
+    elapsed = time.perf_counter() - STARTED_AT
+    application.bot_data['startup_seconds'] = elapsed
+    logger.info(f"Startup completed in {elapsed:.2f}s")
+    if METRICS_PORT:
+        application.bot_data['metrics_runner'] = await start_metrics_server(METRICS_LISTEN, METRICS_PORT)
+
+async def post_shutdown(application: Application):
+    """Release resources after the application stops."""
+    router = application.bot_data.get('callback_router')
+    if router:
+        router.log_stats()
+    metrics_runner = application.bot_data.get('metrics_runner')
+    if metrics_runner:
+        await metrics_runner.cleanup()
+    async_database.shutdown()
+    tracing.shutdown()
+    close_database()
+
+# Тип обработчика -> тип обновления, который он обрабатывает
+_HANDLER_UPDATE_TYPES = {
+    CommandHandler: Update.MESSAGE,
+    MessageHandler: Update.MESSAGE,
+    CallbackQueryHandler: Update.CALLBACK_QUERY,
+    CallbackRouter: Update.CALLBACK_QUERY,
+    InlineQueryHandler: Update.INLINE_QUERY,
+}
+
+def _handler_update_types(handler: BaseHandler) -> Optional[set]:
+    """Update types a handler can react to; None means unknown."""
+    if isinstance(handler, ConversationHandler):
+        nested = list(handler.entry_points) + list(handler.fallbacks)
+        for state_handlers in handler.states.values():
+            nested.extend(state_handlers)
+        types = set()
+        for child in nested:
+            child_types = _handler_update_types(child)
+            if child_types is None:
+                return None
+            types |= child_types
+        return types
+    if isinstance(handler, TypeHandler):
+        # Фильтр доступа не требует отдельного типа обновлений
+        return set()
+    for handler_type, update_type in _HANDLER_UPDATE_TYPES.items():
+        if isinstance(handler, handler_type):
+            return {update_type}
+    return None
+
+def allowed_updates(application: Application) -> list:
+    """Update types requested from Telegram, based on the registered handlers."""
+    types = set()
+    for group_handlers in application.handlers.values():
+        for handler in group_handlers:
+            handler_types = _handler_update_types(handler)
+            if handler_types is None:
+                logger.warning(f"Unknown handler type {type(handler).__name__}, requesting all update types")
+                return Update.ALL_TYPES
+            types |= handler_types
+    return sorted(types)
+
+def collect_cache_metrics():
+    """Expose keyboard registry and category cache counters through metrics."""
+    def keyboard_counter(key):
+        return lambda: {name: stats[key] for name, stats in keyboard_registry.stats().items()}
+
+    def category_counter(key):
+        return lambda: {name: stats[key] for name, stats in get_category_cache_stats().items()}
+
+    metrics.collect(KEYBOARDS_BUILT, keyboard_counter('built'))
+    metrics.collect(KEYBOARDS_REUSED, keyboard_counter('hits'))
+    metrics.collect(KEYBOARDS_CACHED, keyboard_counter('cached'))
+    metrics.collect(CATEGORY_CACHE_HITS, category_counter('hits'))
+    metrics.collect(CATEGORY_CACHE_MISSES, category_counter('misses'))
+
+def build_application(request=None, rate_limiter: Optional[OutboundRateLimiter] = None) -> Application:
+    """Create the application and register all handlers.
+
+    ``request`` replaces the HTTP client used for Bot API calls and
+    ``rate_limiter`` the default Telegram limits (for tests and benchmarks).
+    """
+    builder = (
+        Application.builder()
+        .token(BOT_TOKEN)
+        .concurrent_updates(ChatUpdateProcessor(MAX_CONCURRENT_UPDATES))
+        .persistence(SQLitePersistence())
+        .rate_limiter(rate_limiter or OutboundRateLimiter())
+        .post_init(post_init)
+        .post_shutdown(post_shutdown)
+    )
+    if TELEGRAM_API_URL:
+        builder = builder.base_url(TELEGRAM_API_URL)
+    if request is not None:
+        builder = builder.request(request).get_updates_request(request)
+    application = builder.build()
     
-    # Create application
-    application = Application.builder().token(BOT_TOKEN).build()
+    if application.job_queue:
+        # Периодический checkpoint WAL-журнала
+        if DB_CHECKPOINT_INTERVAL > 0:
+            application.job_queue.run_repeating(
+                wal_checkpoint_job, interval=DB_CHECKPOINT_INTERVAL, first=DB_CHECKPOINT_INTERVAL
+            )
+        # Проверка сохранённых видео разделов с медиа
+        application.job_queue.run_repeating(
+            media_check_job, interval=MEDIA_CHECK_INTERVAL, first=60
+        )
+    else:
+        logger.warning("JobQueue is not available, background jobs disabled")
+    
+    # Статические меню строятся один раз, дальше отдаётся готовый объект
+    keyboard_registry.build_all()
     
     # Register handlers
+    # Проверка доступа раньше всех остальных групп
+    application.add_handler(TypeHandler(Update, auth_gate), group=-1)
     application.add_handler(CommandHandler("start", start))
-    # Main menu handler должен быть зарегистрирован первым с высоким приоритетом
-    application.add_handler(CallbackQueryHandler(main_menu, pattern="^main_menu$"), group=0)
-    # Section selection handler (для inline-клавиатуры главного меню)
-    application.add_handler(CallbackQueryHandler(section_handler, pattern="^section:"), group=0)
+    application.add_handler(CommandHandler("metrics", metrics_command))
+    application.add_handler(CommandHandler("queries", queries_command))
+    # Все обычные кнопки - один обработчик с поиском по дереву маршрутов;
+    # кнопки диалогов остаются в своих ConversationHandler
+    router = CallbackRouter([
+        Route("main_menu", main_menu),
+        Route("section:*", section_handler),
+    ])
+    router.add_routes(get_section_routes())
+    application.add_handler(router)
+    application.bot_data['callback_router'] = router
     
     # Register all section handlers
-    for handler in get_movies_handlers():
+    for handler in get_section_handlers():
         application.add_handler(handler)
     
-    for handler in get_activities_handlers():
+    for handler in get_search_handlers():
         application.add_handler(handler)
     
-    for handler in get_trips_handlers():
-        application.add_handler(handler)
-    
-    for handler in get_tiktok_handlers():
-        application.add_handler(handler)
+    # Замер времени каждого обработчика (после регистрации всех)
+    instrument_application(application)
+    collect_cache_metrics()
     
-    for handler in get_photos_handlers():
-        application.add_handler(handler)
-    
-    for handler in get_games_handlers():
-        application.add_handler(handler)
+    return application
+
+def main():
+    """Start the bot."""
+    # Initialize database
+    db_started = time.perf_counter()
+    init_database()
+    logger.info(f"Database ready in {(time.perf_counter() - db_started) * 1000:.1f} ms")
     
-    for handler in get_sexual_handlers():
-        application.add_handler(handler)
+    application = build_application()
+    updates = allowed_updates(application)
+    logger.info(f"Requesting update types: {', '.join(updates)}")
     
     # Start bot
-    logger.info("Bot starting...")
-    application.run_polling(allowed_updates=Update.ALL_TYPES)
+    if BOT_MODE == "webhook":
+        logger.info("Bot starting in webhook mode...")
+        asyncio.run(run_webhook(
+            application, WEBHOOK_LISTEN, WEBHOOK_PORT, WEBHOOK_PATH, WEBHOOK_SECRET,
+            url=WEBHOOK_URL, allowed_updates=updates
+        ))
+    else:
+        logger.info("Bot starting...")
+        application.run_polling(allowed_updates=updates)
 
 if __name__ == '__main__':
     main()
-
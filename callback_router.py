@@ -0,0 +1,177 @@
+"""One handler for all plain callback buttons, dispatching through a trie."""
+import logging
+import time
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from telegram import Update
+from telegram.ext import BaseHandler
+
+logger = logging.getLogger(__name__)
+
+# Сегменты шаблона: "#" - число, "*" - любой непустой остаток (только в конце)
+NUMBER = "#"
+REST = "*"
+
+class Route(NamedTuple):
+    """A callback_data pattern such as ``movie:#:delete`` and its handler.
+
+    ``paged`` routes also accept the ``:page:N`` suffix of list keyboards.
+    """
+    pattern: str
+    callback: Callable
+    paged: bool = False
+
+class _Node:
+    __slots__ = ("children", "number", "route", "rest")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.number: Optional["_Node"] = None
+        self.route: Optional[Route] = None
+        self.rest: Optional[Route] = None
+
+class _RouteStats:
+    __slots__ = ("calls", "lookup_ns", "handler_ns", "max_handler_ns")
+
+    def __init__(self):
+        self.calls = 0
+        self.lookup_ns = 0
+        self.handler_ns = 0
+        self.max_handler_ns = 0
+
+class CallbackRouter(BaseHandler[Update, object]):
+    """Replaces a chain of regex CallbackQueryHandlers.
+
+    callback_data is split on ":" once and walked down a trie of route
+    segments, so finding the handler costs the same whatever the number
+    of routes. Literal segments win over ``#``, ``#`` over ``*``.
+    ConversationHandlers keep their own CallbackQueryHandlers: their
+    entry points and states depend on the conversation state, not only
+    on the data. ``stats`` reports lookup and handler time per route.
+    """
+
+    def __init__(self, routes: Iterable[Route] = ()):
+        super().__init__(self._noop)
+        self._root = _Node()
+        self._stats: Dict[str, _RouteStats] = {}
+        self.unrouted = 0
+        self.add_routes(routes)
+
+    @staticmethod
+    async def _noop(update: Update, context):
+        """Never called: handle_update dispatches to the matched route."""
+
+    def add(self, pattern: str, callback: Callable, paged: bool = False):
+        """Register one route."""
+        self._insert(Route(pattern, callback, paged), pattern.split(":"))
+        if paged:
+            self._insert(Route(pattern, callback, paged), pattern.split(":") + ["page", NUMBER])
+        self._stats.setdefault(pattern, _RouteStats())
+
+    def add_routes(self, routes: Iterable[Route]):
+        """Register several routes."""
+        for route in routes:
+            self.add(*route)
+
+    def wrap_callbacks(self, wrapper: Callable[[Callable], Callable]):
+        """Replace every route callback with ``wrapper(callback)`` (used by metrics)."""
+        wrapped: Dict[int, Callable] = {}
+        nodes = [self._root]
+        while nodes:
+            node = nodes.pop()
+            for attr in ("route", "rest"):
+                route = getattr(node, attr)
+                if route is not None:
+                    callback = wrapped.setdefault(id(route.callback), wrapper(route.callback))
+                    setattr(node, attr, route._replace(callback=callback))
+            nodes.extend(node.children.values())
+            if node.number is not None:
+                nodes.append(node.number)
+
+    def _insert(self, route: Route, segments: List[str]):
+        node = self._root
+        for index, segment in enumerate(segments):
+            if segment == REST:
+                if index != len(segments) - 1:
+                    raise ValueError(f"'{REST}' must be the last segment: {route.pattern}")
+                if node.rest is not None:
+                    raise ValueError(f"Duplicate route: {route.pattern}")
+                node.rest = route
+                return
+            if segment == NUMBER:
+                if node.number is None:
+                    node.number = _Node()
+                node = node.number
+            else:
+                node = node.children.setdefault(segment, _Node())
+        if node.route is not None:
+            raise ValueError(f"Duplicate route: {route.pattern}")
+        node.route = route
+
+    def _match(self, node: _Node, segments: List[str], index: int) -> Optional[Route]:
+        if index == len(segments):
+            return node.route
+        segment = segments[index]
+        child = node.children.get(segment)
+        if child is not None:
+            route = self._match(child, segments, index + 1)
+            if route is not None:
+                return route
+        if node.number is not None and segment.isdigit():
+            route = self._match(node.number, segments, index + 1)
+            if route is not None:
+                return route
+        return node.rest
+
+    def resolve(self, data: str) -> Optional[Route]:
+        """Route for callback_data, or None."""
+        return self._match(self._root, data.split(":"), 0)
+
+    def check_update(self, update: object) -> Optional[Tuple[Route, int]]:
+        if not isinstance(update, Update) or update.callback_query is None:
+            return None
+        data = update.callback_query.data
+        if not isinstance(data, str):
+            return None
+        started = time.perf_counter_ns()
+        route = self.resolve(data)
+        if route is None:
+            self.unrouted += 1
+            return None
+        return route, time.perf_counter_ns() - started
+
+    async def handle_update(self, update: Update, application, check_result: Tuple[Route, int], context):
+        route, lookup_ns = check_result
+        started = time.perf_counter_ns()
+        try:
+            return await route.callback(update, context)
+        finally:
+            elapsed = time.perf_counter_ns() - started
+            stats = self._stats[route.pattern]
+            stats.calls += 1
+            stats.lookup_ns += lookup_ns
+            stats.handler_ns += elapsed
+            stats.max_handler_ns = max(stats.max_handler_ns, elapsed)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-route calls, mean lookup time (µs) and mean/max handler time (ms)."""
+        return {
+            pattern: {
+                'calls': stats.calls,
+                'lookup_us': stats.lookup_ns / stats.calls / 1e3,
+                'handler_ms': stats.handler_ns / stats.calls / 1e6,
+                'max_handler_ms': stats.max_handler_ns / 1e6,
+            }
+            for pattern, stats in self._stats.items() if stats.calls
+        }
+
+    def log_stats(self):
+        """Log per-route statistics, the most time-consuming routes first."""
+        rows = sorted(self.stats().items(), key=lambda item: -item[1]['calls'] * item[1]['handler_ms'])
+        for pattern, stats in rows:
+            logger.info(
+                f"route {pattern}: {stats['calls']} call(s), lookup {stats['lookup_us']:.1f}µs, "
+                f"handler {stats['handler_ms']:.2f}ms (max {stats['max_handler_ms']:.2f}ms)"
+            )
+        if self.unrouted:
+            logger.info(f"{self.unrouted} callback(s) left to conversation handlers")
@@ -0,0 +1,57 @@
+"""In-process read-through cache for small category tables."""
+import sqlite3
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+_Snapshot = Tuple[List[sqlite3.Row], Dict[int, sqlite3.Row], Dict[str, sqlite3.Row]]
+
+class CategoryCache:
+    """Caches a category table in memory, indexed by id and by name.
+
+    The table is loaded on first access and kept until ``invalidate()``
+    is called by the function that writes to it.
+    """
+
+    def __init__(self, loader: Callable[[], List[sqlite3.Row]], name_field: str = 'name'):
+        self._loader = loader
+        self._name_field = name_field
+        self._lock = threading.Lock()
+        self._snapshot: Optional[_Snapshot] = None
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self) -> _Snapshot:
+        """Return the cached snapshot, loading it from the database on a miss."""
+        with self._lock:
+            if self._snapshot is not None:
+                self.hits += 1
+                return self._snapshot
+            self.misses += 1
+            rows = list(self._loader())
+            self._snapshot = (
+                rows,
+                {row['id']: row for row in rows},
+                {row[self._name_field]: row for row in rows},
+            )
+            return self._snapshot
+
+    def all(self) -> List[sqlite3.Row]:
+        """All categories in loader order."""
+        return self._load()[0]
+
+    def by_id(self, category_id: int) -> Optional[sqlite3.Row]:
+        """Category with the given id, or None."""
+        return self._load()[1].get(category_id)
+
+    def by_name(self, name: str) -> Optional[sqlite3.Row]:
+        """Category with the given name, or None."""
+        return self._load()[2].get(name)
+
+    def invalidate(self):
+        """Drop cached rows; the next access reloads the table."""
+        with self._lock:
+            self._snapshot = None
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters."""
+        return {'hits': self.hits, 'misses': self.misses}
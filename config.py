@@ -10,8 +10,9 @@ load_dotenv()
 
 # Base directory
 BASE_DIR = Path(__file__).parent
-DATA_DIR = BASE_DIR / "data"
-CONFIG_FILE = BASE_DIR / "config.json"
+# Каталог с базой и трассами; переопределяется для тестовых запусков и бенчмарков
+DATA_DIR = Path(os.getenv("DATA_DIR", BASE_DIR / "data"))
+CONFIG_FILE = Path(os.getenv("CONFIG_FILE", BASE_DIR / "config.json"))
 
 # Ensure data directory exists
 DATA_DIR.mkdir(exist_ok=True)
@@ -21,6 +22,35 @@ BOT_TOKEN = os.getenv("BOT_TOKEN")
 if not BOT_TOKEN:
     raise ValueError("BOT_TOKEN not found in environment variables")
 
+# Режим получения обновлений: polling (по умолчанию) или webhook
+BOT_MODE = os.getenv("BOT_MODE", "polling").strip().lower()
+if BOT_MODE not in ("polling", "webhook"):
+    raise ValueError(f"Invalid BOT_MODE: {BOT_MODE} (expected 'polling' or 'webhook')")
+
+# Webhook: публичный URL (пустой - не регистрировать webhook в Telegram), секрет и адрес сервера
+WEBHOOK_URL = os.getenv("WEBHOOK_URL", "")
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", "")
+WEBHOOK_LISTEN = os.getenv("WEBHOOK_LISTEN", "0.0.0.0")
+WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", "8080"))
+WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "/telegram")
+if BOT_MODE == "webhook" and not WEBHOOK_SECRET:
+    raise ValueError("WEBHOOK_SECRET is required when BOT_MODE=webhook")
+
+# Адрес Bot API (для локального Bot API сервера или тестового клиента); пустой - api.telegram.org
+TELEGRAM_API_URL = os.getenv("TELEGRAM_API_URL", "")
+
+# Метрики в формате Prometheus: порт локального HTTP-сервера (0 - не запускать)
+METRICS_LISTEN = os.getenv("METRICS_LISTEN", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+
+# Трассировка: доля обновлений с трассой (0 - выключена), файл JSON-lines и адрес OTLP/HTTP коллектора
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0"))
+TRACE_FILE = os.getenv("TRACE_FILE", str(DATA_DIR / "traces.jsonl"))
+TRACE_OTLP_URL = os.getenv("TRACE_OTLP_URL", "")
+
+# Запросы к базе дольше порога (мс) попадают в лог вместе с планом выполнения
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+
 # Load user configuration
 def load_config():
     """Load user configuration from config.json."""
@@ -55,7 +85,14 @@ except FileNotFoundError:
     USER_IDS = []
     USER_DISPLAY_NAMES = {}
 
+# Множество для проверки доступа за O(1); USER_IDS сохраняет порядок пользователей
+AUTHORIZED_USER_IDS = frozenset(USER_IDS)
+
+# Database connection profile (PRAGMA overrides, see db_pool.DEFAULT_PRAGMAS)
+DB_SETTINGS = dict(CONFIG.get('database', {}))
+DB_CHECKPOINT_INTERVAL = int(DB_SETTINGS.pop('checkpoint_interval', 300))
+
 def is_authorized_user(telegram_id: int) -> bool:
     """Check if user is authorized."""
-    return telegram_id in USER_IDS
+    return telegram_id in AUTHORIZED_USER_IDS
 
@@ -1,731 +1,448 @@
 """Database operations and initialization."""
 
 # Maintenance: file refreshed without functional changes (2025-11-20).
+import re
+import json
 import sqlite3
 import logging
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
-from config import DATA_DIR
+import tracing
+from config import DATA_DIR, DB_SETTINGS
+from query_stats import query_stats
+from db_pool import ConnectionPool
+from category_cache import CategoryCache
+from random_picker import RandomPicker
+from leaderboard import Leaderboard
+from models import Page, SearchResult, SectionSpec
+from sections import SECTIONS
+from migrations import (
+    apply_migrations, read_schema_version, LATEST_VERSION, SEARCH_ROWID_FACTOR, SEARCH_SOURCES
+)
 
 logger = logging.getLogger(__name__)
 
 DB_PATH = DATA_DIR / "multilists.db"
+DB_READERS = 3
+PAGE_SIZE = 10
+# Сколько последних случайных выборов не предлагать повторно
+RANDOM_HISTORY = 5
+SEARCH_LIMIT = 20
 
-def get_connection():
-    """Get database connection."""
-    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+_pool = ConnectionPool(DB_PATH, readers=DB_READERS, pragmas=DB_SETTINGS)
 
-def init_database():
-    """Initialize database with all required tables."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # Movies
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS movie_categories (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT UNIQUE NOT NULL
-        )
-    """)
-    
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS movies (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL,
-            note TEXT,
-            category_id INTEGER NOT NULL,
-            user1_rating INTEGER,
-            user2_rating INTEGER,
-            watched INTEGER DEFAULT 0,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (category_id) REFERENCES movie_categories(id)
-        )
-    """)
-    
-    # Insert default movie categories
-    default_movie_categories = ['Фильм', 'Сериал', 'Мультик']
-    for cat in default_movie_categories:
-        cursor.execute("INSERT OR IGNORE INTO movie_categories (name) VALUES (?)", (cat,))
-    
-    # Activities
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS activities (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL,
-            note TEXT,
-            status TEXT DEFAULT 'planned',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    
-    # Trips
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS trip_categories (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT UNIQUE NOT NULL
-        )
-    """)
-    
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS trips (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL,
-            note TEXT,
-            category_id INTEGER NOT NULL,
-            visited INTEGER DEFAULT 0,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (category_id) REFERENCES trip_categories(id)
-        )
-    """)
-    
-    # Добавить колонку visited если её нет (для существующих баз данных)
-    try:
-        cursor.execute("ALTER TABLE trips ADD COLUMN visited INTEGER DEFAULT 0")
-    except sqlite3.OperationalError:
-        pass  # Колонка уже существует
-    
-    # Insert default trip categories
-    default_trip_categories = ['Пешком', 'Поездки', 'Места в Херцег-Нови']
-    for cat in default_trip_categories:
-        cursor.execute("INSERT OR IGNORE INTO trip_categories (name) VALUES (?)", (cat,))
-    
-    # TikTok Trends
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS tiktok_trends (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL,
-            video_file_id TEXT,
-            status TEXT DEFAULT 'todo',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    
-    # Photo Categories
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS photo_categories (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT UNIQUE NOT NULL,
-            link TEXT,
-            description TEXT
-        )
-    """)
-    
-    # Удалить все существующие категории и вставить только две дефолтные
-    cursor.execute("DELETE FROM photo_categories")
-    cursor.execute("INSERT INTO photo_categories (title) VALUES (?)", ('for all',))
-    cursor.execute("INSERT INTO photo_categories (title) VALUES (?)", ('not for all',))
-    
-    # Games
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS games (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL,
-            note TEXT,
-            genre TEXT,
-            status TEXT DEFAULT 'pending',
-            user1_rating INTEGER,
-            user2_rating INTEGER,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    
-    # Sexual (без категорий, простой список)
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS sexual (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL,
-            link TEXT,
-            description TEXT
-        )
-    """)
-    
-    conn.commit()
-    conn.close()
-    logger.info("Database initialized successfully")
-
-# Movie operations
-def add_movie(title: str, note: Optional[str], category_id: int) -> int:
-    """Add a new movie."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO movies (title, note, category_id) VALUES (?, ?, ?)",
-        (title, note, category_id)
+def get_connection():
+    """Get the shared write connection (context manager, commits on exit)."""
+    return _pool.writer()
+
+def close_database():
+    """Close all pooled connections."""
+    _pool.close()
+
+def checkpoint_wal(mode: str = "PASSIVE") -> Optional[sqlite3.Row]:
+    """Copy WAL pages back into the main database file."""
+    return _pool.checkpoint(mode)
+
+def _fetchall(sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+    """Run a read query and return all rows."""
+    with tracing.span("sql", statement=sql) as span, _pool.reader() as conn:
+        with query_stats.measure(conn, sql, params) as measure:
+            rows = conn.execute(sql, params).fetchall()
+            measure.rows = len(rows)
+        span.set("rows", measure.rows)
+        return rows
+
+def _fetchone(sql: str, params: tuple = ()) -> Optional[sqlite3.Row]:
+    """Run a read query and return the first row."""
+    with tracing.span("sql", statement=sql) as span, _pool.reader() as conn:
+        with query_stats.measure(conn, sql, params) as measure:
+            row = conn.execute(sql, params).fetchone()
+            measure.rows = int(row is not None)
+        span.set("rows", measure.rows)
+        return row
+
+def _execute(sql: str, params: tuple = (), conn: Optional[sqlite3.Connection] = None) -> int:
+    """Run a write statement and return lastrowid.
+
+    Pass ``conn`` (the writer) to run it inside a larger transaction.
+    """
+    if conn is None:
+        with _pool.writer() as conn:
+            return _execute(sql, params, conn)
+    with tracing.span("sql", statement=sql) as span, query_stats.measure(conn, sql, params) as measure:
+        cursor = conn.execute(sql, params)
+        measure.rows = max(cursor.rowcount, 0)
+        span.set("rows", measure.rows)
+        return cursor.lastrowid
+
+def _fetch_page(table: str, where: str, params: tuple, order_by: str,
+                page: int, per_page: int) -> Page:
+    """Fetch one page of rows plus the total count; clamps page to the last one."""
+    total = _fetchone(f"SELECT COUNT(*) FROM {table} {where}", params)[0]
+    last_page = max(0, (total - 1) // per_page)
+    page = min(max(page, 0), last_page)
+    items = _fetchall(
+        f"SELECT * FROM {table} {where} ORDER BY {order_by} LIMIT ? OFFSET ?",
+        params + (per_page, page * per_page)
     )
-    movie_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return movie_id
-
-def get_movies(watched: bool = False, category_id: Optional[int] = None) -> List[sqlite3.Row]:
-    """Get movies list."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    if category_id:
-        cursor.execute(
-            "SELECT * FROM movies WHERE watched = ? AND category_id = ? ORDER BY created_at DESC",
-            (1 if watched else 0, category_id)
-        )
-    else:
-        cursor.execute(
-            "SELECT * FROM movies WHERE watched = ? ORDER BY created_at DESC",
-            (1 if watched else 0,)
-        )
-    
-    results = cursor.fetchall()
-    conn.close()
-    return results
-
-def get_movie(movie_id: int) -> Optional[sqlite3.Row]:
-    """Get a single movie."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM movies WHERE id = ?", (movie_id,))
-    result = cursor.fetchone()
-    conn.close()
-    return result
-
-def update_movie(movie_id: int, title: Optional[str] = None, note: Optional[str] = None):
-    """Update movie."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    updates = []
-    params = []
-    
-    if title is not None:
-        updates.append("title = ?")
-        params.append(title)
-    if note is not None:
-        updates.append("note = ?")
-        params.append(note)
-    
-    if updates:
-        params.append(movie_id)
-        cursor.execute(f"UPDATE movies SET {', '.join(updates)} WHERE id = ?", params)
-        conn.commit()
-    
-    conn.close()
-
-def mark_movie_watched(movie_id: int, user1_rating: Optional[int], user2_rating: Optional[int]):
-    """Mark movie as watched with ratings."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "UPDATE movies SET watched = 1, user1_rating = ?, user2_rating = ? WHERE id = ?",
-        (user1_rating, user2_rating, movie_id)
+    return Page(items, total, page, per_page)
+
+def _fetch_rated(table: str, ids: List[int]) -> List[sqlite3.Row]:
+    """Fetch rows by primary key with avg_rating, keeping the order of ``ids``."""
+    if not ids:
+        return []
+    placeholders = ", ".join("?" * len(ids))
+    rows = _fetchall(
+        f"""SELECT *, (COALESCE(user1_rating, 0) + COALESCE(user2_rating, 0)) / 2.0 AS avg_rating
+            FROM {table} WHERE id IN ({placeholders})""",
+        tuple(ids)
     )
-    conn.commit()
-    conn.close()
-
-def delete_movie(movie_id: int):
-    """Delete a movie."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM movies WHERE id = ?", (movie_id,))
-    conn.commit()
-    conn.close()
-
-def get_random_movie(exclude_series: bool = True) -> Optional[sqlite3.Row]:
-    """Get a random unwatched movie, optionally excluding series."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    if exclude_series:
-        # Get category_id for 'Сериал'
-        cursor.execute("SELECT id FROM movie_categories WHERE name = ?", ('Сериал',))
-        series_cat = cursor.fetchone()
-        if series_cat:
-            cursor.execute(
-                """SELECT * FROM movies WHERE watched = 0 AND category_id != ? 
-                   ORDER BY RANDOM() LIMIT 1""",
-                (series_cat['id'],)
-            )
-        else:
-            cursor.execute("SELECT * FROM movies WHERE watched = 0 ORDER BY RANDOM() LIMIT 1")
-    else:
-        cursor.execute("SELECT * FROM movies WHERE watched = 0 ORDER BY RANDOM() LIMIT 1")
-    
-    result = cursor.fetchone()
-    conn.close()
-    return result
-
-def get_movie_top10(user_num: Optional[int] = None) -> List[sqlite3.Row]:
-    """Get top 10 movies by rating."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    if user_num == 1:
-        cursor.execute(
-            """SELECT * FROM movies WHERE watched = 1 AND user1_rating IS NOT NULL 
-               ORDER BY user1_rating DESC LIMIT 10"""
-        )
-    elif user_num == 2:
-        cursor.execute(
-            """SELECT * FROM movies WHERE watched = 1 AND user2_rating IS NOT NULL 
-               ORDER BY user2_rating DESC LIMIT 10"""
+    by_id = {row['id']: row for row in rows}
+    return [by_id[item_id] for item_id in ids if item_id in by_id]
+
+def init_database():
+    """Initialize database; opens a write transaction only if migrations are pending."""
+    with _pool.reader() as conn:
+        version = read_schema_version(conn.cursor())
+    if version >= LATEST_VERSION:
+        logger.info(f"Database schema is up to date (version {version})")
+        return
+    with get_connection() as conn:
+        applied = apply_migrations(conn.cursor())
+    logger.info(f"Applied {applied} migration(s), schema version {LATEST_VERSION}")
+
+# List sections (sections.py)
+# Время создания записи (Unix) для взвешенного случайного выбора; вес считается при выборе
+_CREATED_TS = "CAST(strftime('%s', created_at) AS REAL)"
+
+def _insert_columns(spec: SectionSpec) -> List[str]:
+    """Columns written by add_section_item: the fields plus the category id."""
+    columns = [field.name for field in spec.fields]
+    if spec.category and spec.category.table:
+        columns.append(spec.category.column)
+    return columns
+
+def _section_queries(spec: SectionSpec) -> Dict[str, str]:
+    """SQL of one section, built once so sqlite3 reuses the prepared statements."""
+    table, status = spec.table, spec.status_column
+    columns = _insert_columns(spec)
+    editable = [field.name for field in spec.fields if not field.video]
+    select, joins = ["t.*"], []
+    queries = {
+        'insert': f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+        # NULL оставляет текущее значение столбца
+        'update': f"UPDATE {table} SET {', '.join(f'{c} = COALESCE(?, {c})' for c in editable)} WHERE id = ?",
+        'status': f"UPDATE {table} SET {status} = ? WHERE id = ?",
+        'delete': f"DELETE FROM {table} WHERE id = ?",
+    }
+    category = spec.category
+    category_column = "NULL"
+    if category and category.table:
+        category_column = category.column
+        select.append("c.name AS category_name")
+        joins.append(f"LEFT JOIN {category.table} c ON c.id = t.{category.column}")
+        queries['categories'] = f"SELECT * FROM {category.table} ORDER BY name"
+        queries['add_category'] = f"INSERT INTO {category.table} (name) VALUES (?)"
+    elif category:
+        # Текстовая категория (жанр): пустая строка - то же, что её отсутствие
+        category_column = f"NULLIF({category.column}, '')"
+        by_status = f"{status} = ? AND " if spec.statuses else ""
+        queries['categories'] = (
+            f"SELECT DISTINCT {category.column} AS name FROM {table} "
+            f"WHERE {by_status}{category.column} IS NOT NULL AND {category.column} != '' ORDER BY name"
         )
-    else:
-        cursor.execute(
-            """SELECT *, (COALESCE(user1_rating, 0) + COALESCE(user2_rating, 0)) / 2.0 as avg_rating
-               FROM movies WHERE watched = 1 
-               AND (user1_rating IS NOT NULL OR user2_rating IS NOT NULL)
-               ORDER BY avg_rating DESC LIMIT 10"""
+    if spec.rated:
+        select.append(
+            """CASE WHEN t.user1_rating IS NULL AND t.user2_rating IS NULL THEN NULL
+                    ELSE printf('%.1f', (COALESCE(t.user1_rating, 0) + COALESCE(t.user2_rating, 0)) / 2.0)
+               END AS avg_rating"""
         )
-    
-    results = cursor.fetchall()
-    conn.close()
-    return results
-
-def get_movie_categories() -> List[sqlite3.Row]:
-    """Get all movie categories."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM movie_categories ORDER BY name")
-    results = cursor.fetchall()
-    conn.close()
-    return results
-
-def add_movie_category(name: str) -> int:
-    """Add a new movie category."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO movie_categories (name) VALUES (?)", (name,))
-    cat_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return cat_id
-
-# Activity operations
-def add_activity(title: str, note: Optional[str]) -> int:
-    """Add a new activity."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO activities (title, note) VALUES (?, ?)",
-        (title, note)
-    )
-    activity_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return activity_id
-
-def get_activities(status: str = 'planned') -> List[sqlite3.Row]:
-    """Get activities by status."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT * FROM activities WHERE status = ? ORDER BY created_at DESC",
-        (status,)
-    )
-    results = cursor.fetchall()
-    conn.close()
-    return results
-
-def get_activity(activity_id: int) -> Optional[sqlite3.Row]:
-    """Get a single activity."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM activities WHERE id = ?", (activity_id,))
-    result = cursor.fetchone()
-    conn.close()
-    return result
-
-def update_activity(activity_id: int, title: Optional[str] = None, note: Optional[str] = None):
-    """Update activity."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    updates = []
-    params = []
-    
-    if title is not None:
-        updates.append("title = ?")
-        params.append(title)
-    if note is not None:
-        updates.append("note = ?")
-        params.append(note)
-    
-    if updates:
-        params.append(activity_id)
-        cursor.execute(f"UPDATE activities SET {', '.join(updates)} WHERE id = ?", params)
-        conn.commit()
-    
-    conn.close()
-
-def mark_activity_done(activity_id: int):
-    """Mark activity as done."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("UPDATE activities SET status = 'done' WHERE id = ?", (activity_id,))
-    conn.commit()
-    conn.close()
-
-def delete_activity(activity_id: int):
-    """Delete an activity."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM activities WHERE id = ?", (activity_id,))
-    conn.commit()
-    conn.close()
-
-# Trip operations
-def add_trip(title: str, note: Optional[str], category_id: int) -> int:
-    """Add a new trip."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO trips (title, note, category_id) VALUES (?, ?, ?)",
-        (title, note, category_id)
-    )
-    trip_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return trip_id
-
-def get_trips(category_id: Optional[int] = None) -> List[sqlite3.Row]:
-    """Get trips."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    if category_id:
-        cursor.execute(
-            "SELECT * FROM trips WHERE category_id = ? ORDER BY created_at DESC",
-            (category_id,)
+        queries['rate'] = f"UPDATE {table} SET {status} = ?, user1_rating = ?, user2_rating = ? WHERE id = ?"
+        queries['leaderboard'] = (
+            f"SELECT id, {category_column} AS category, user1_rating, user2_rating FROM {table} WHERE {status} = ?"
         )
-    else:
-        cursor.execute("SELECT * FROM trips ORDER BY created_at DESC")
-    
-    results = cursor.fetchall()
-    conn.close()
-    return results
-
-def get_trip(trip_id: int) -> Optional[sqlite3.Row]:
-    """Get a single trip."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM trips WHERE id = ?", (trip_id,))
-    result = cursor.fetchone()
-    conn.close()
-    return result
-
-def update_trip(trip_id: int, title: Optional[str] = None, note: Optional[str] = None):
-    """Update trip."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    updates = []
-    params = []
-    
-    if title is not None:
-        updates.append("title = ?")
-        params.append(title)
-    if note is not None:
-        updates.append("note = ?")
-        params.append(note)
-    
-    if updates:
-        params.append(trip_id)
-        cursor.execute(f"UPDATE trips SET {', '.join(updates)} WHERE id = ?", params)
-        conn.commit()
-    
-    conn.close()
-
-def delete_trip(trip_id: int):
-    """Delete a trip."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM trips WHERE id = ?", (trip_id,))
-    conn.commit()
-    conn.close()
-
-def mark_trip_visited(trip_id: int):
-    """Mark trip as visited."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("UPDATE trips SET visited = 1 WHERE id = ?", (trip_id,))
-    conn.commit()
-    conn.close()
-
-def get_trip_categories() -> List[sqlite3.Row]:
-    """Get all trip categories."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM trip_categories ORDER BY name")
-    results = cursor.fetchall()
-    conn.close()
-    return results
-
-def add_trip_category(name: str) -> int:
-    """Add a new trip category."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO trip_categories (name) VALUES (?)", (name,))
-    cat_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return cat_id
-
-# TikTok operations
-def add_tiktok_trend(title: str, video_file_id: Optional[str]) -> int:
-    """Add a new TikTok trend."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO tiktok_trends (title, video_file_id) VALUES (?, ?)",
-        (title, video_file_id)
-    )
-    trend_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return trend_id
-
-def get_tiktok_trends(status: str = 'todo') -> List[sqlite3.Row]:
-    """Get TikTok trends by status."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT * FROM tiktok_trends WHERE status = ? ORDER BY created_at DESC",
-        (status,)
-    )
-    results = cursor.fetchall()
-    conn.close()
-    return results
-
-def get_tiktok_trend(trend_id: int) -> Optional[sqlite3.Row]:
-    """Get a single TikTok trend."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM tiktok_trends WHERE id = ?", (trend_id,))
-    result = cursor.fetchone()
-    conn.close()
-    return result
-
-def mark_tiktok_trend_done(trend_id: int):
-    """Mark TikTok trend as done."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("UPDATE tiktok_trends SET status = 'done' WHERE id = ?", (trend_id,))
-    conn.commit()
-    conn.close()
-
-def delete_tiktok_trend(trend_id: int):
-    """Delete a TikTok trend."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM tiktok_trends WHERE id = ?", (trend_id,))
-    conn.commit()
-    conn.close()
-
-# Photo category operations
-def get_photo_categories() -> List[sqlite3.Row]:
-    """Get all photo categories."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM photo_categories ORDER BY id")
-    results = cursor.fetchall()
-    conn.close()
-    return results
-
-def get_photo_category(category_id: int) -> Optional[sqlite3.Row]:
-    """Get a single photo category."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM photo_categories WHERE id = ?", (category_id,))
-    result = cursor.fetchone()
-    conn.close()
-    return result
-
-def add_photo_category(title: str, link: Optional[str], description: Optional[str]) -> int:
-    """Add a new photo category."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO photo_categories (title, link, description) VALUES (?, ?, ?)",
-        (title, link, description)
-    )
-    cat_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return cat_id
-
-def update_photo_category(category_id: int, title: Optional[str] = None, 
-                         link: Optional[str] = None, description: Optional[str] = None):
-    """Update photo category."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    updates = []
-    params = []
-    
-    if title is not None:
-        updates.append("title = ?")
-        params.append(title)
-    if link is not None:
-        updates.append("link = ?")
-        params.append(link)
-    if description is not None:
-        updates.append("description = ?")
-        params.append(description)
-    
-    if updates:
-        params.append(category_id)
-        cursor.execute(f"UPDATE photo_categories SET {', '.join(updates)} WHERE id = ?", params)
-        conn.commit()
-    
-    conn.close()
-
-# Game operations
-def add_game(title: str, note: Optional[str], genre: Optional[str]) -> int:
-    """Add a new game."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO games (title, note, genre) VALUES (?, ?, ?)",
-        (title, note, genre)
-    )
-    game_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return game_id
-
-def get_games(status: str = 'pending') -> List[sqlite3.Row]:
-    """Get games by status."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT * FROM games WHERE status = ? ORDER BY created_at DESC",
-        (status,)
-    )
-    results = cursor.fetchall()
-    conn.close()
-    return results
-
-def get_game(game_id: int) -> Optional[sqlite3.Row]:
-    """Get a single game."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM games WHERE id = ?", (game_id,))
-    result = cursor.fetchone()
-    conn.close()
-    return result
-
-def update_game(game_id: int, title: Optional[str] = None, 
-               note: Optional[str] = None, genre: Optional[str] = None):
-    """Update game."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    updates = []
-    params = []
-    
-    if title is not None:
-        updates.append("title = ?")
-        params.append(title)
-    if note is not None:
-        updates.append("note = ?")
-        params.append(note)
-    if genre is not None:
-        updates.append("genre = ?")
-        params.append(genre)
-    
-    if updates:
-        params.append(game_id)
-        cursor.execute(f"UPDATE games SET {', '.join(updates)} WHERE id = ?", params)
-        conn.commit()
-    
-    conn.close()
-
-def mark_game_done(game_id: int, user1_rating: Optional[int], user2_rating: Optional[int]):
-    """Mark game as done with ratings."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "UPDATE games SET status = 'done', user1_rating = ?, user2_rating = ? WHERE id = ?",
-        (user1_rating, user2_rating, game_id)
-    )
-    conn.commit()
-    conn.close()
-
-def delete_game(game_id: int):
-    """Delete a game."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM games WHERE id = ?", (game_id,))
-    conn.commit()
-    conn.close()
-
-def get_random_game() -> Optional[sqlite3.Row]:
-    """Get a random pending game."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM games WHERE status = 'pending' ORDER BY RANDOM() LIMIT 1")
-    result = cursor.fetchone()
-    conn.close()
-    return result
-
-def get_game_top10(user_num: Optional[int] = None) -> List[sqlite3.Row]:
-    """Get top 10 games by rating."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    if user_num == 1:
-        cursor.execute(
-            """SELECT * FROM games WHERE status = 'done' AND user1_rating IS NOT NULL 
-               ORDER BY user1_rating DESC LIMIT 10"""
+    if spec.random_button:
+        where = f" WHERE {status} = ?" if spec.statuses else ""
+        queries['random'] = f"SELECT id, {_CREATED_TS}, {category_column} FROM {table}{where}"
+    media = spec.media
+    if media:
+        video = next(field.name for field in spec.fields if field.video)
+        select.append("m.file_id, m.file_unique_id, m.duration, m.file_size, "
+                      "m.thumbnail_file_id, m.status AS media_status")
+        joins.append(f"LEFT JOIN {media.table} m ON m.{media.item_column} = t.id")
+        queries['media_save'] = f"""INSERT INTO {media.table}
+                ({media.item_column}, file_id, file_unique_id, duration, file_size, thumbnail_file_id,
+                 status, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, 'ok', CURRENT_TIMESTAMP)
+            ON CONFLICT ({media.item_column}) DO UPDATE SET
+                file_id = excluded.file_id,
+                file_unique_id = COALESCE(excluded.file_unique_id, file_unique_id),
+                duration = COALESCE(excluded.duration, duration),
+                file_size = COALESCE(excluded.file_size, file_size),
+                thumbnail_file_id = COALESCE(excluded.thumbnail_file_id, thumbnail_file_id),
+                status = 'ok',
+                updated_at = CURRENT_TIMESTAMP"""
+        # Колонка записи остаётся в синхронизации с кэшем
+        queries['media_column'] = f"UPDATE {table} SET {video} = ? WHERE id = ?"
+        queries['media_check'] = (
+            f"SELECT {media.item_column} AS item_id, file_id FROM {media.table} ORDER BY checked_at LIMIT ?"
         )
-    elif user_num == 2:
-        cursor.execute(
-            """SELECT * FROM games WHERE status = 'done' AND user2_rating IS NOT NULL 
-               ORDER BY user2_rating DESC LIMIT 10"""
+        queries['media_status'] = (
+            f"UPDATE {media.table} SET status = ?, checked_at = CURRENT_TIMESTAMP WHERE {media.item_column} = ?"
         )
+        queries['media_delete'] = f"DELETE FROM {media.table} WHERE {media.item_column} = ?"
+    queries['get'] = f"SELECT {', '.join(select)} FROM {table} t {' '.join(joins)} WHERE t.id = ?"
+    return queries
+
+_section_sql = {key: _section_queries(spec) for key, spec in SECTIONS.items()}
+
+def _category_loader(key: str):
+    sql = _section_sql[key]['categories']
+    return lambda: _fetchall(sql)
+
+def _leaderboard_loader(key: str):
+    sql, done = _section_sql[key]['leaderboard'], SECTIONS[key].done_status
+    return lambda: _fetchall(sql, (done,))
+
+def _random_loader(key: str):
+    spec = SECTIONS[key]
+    sql = _section_sql[key]['random']
+    params = (spec.statuses[0].value,) if spec.statuses else ()
+
+    def load() -> List[Tuple[int, float]]:
+        excluded = _random_excluded(key)
+        return [(row[0], row[1]) for row in _fetchall(sql, params) if row[2] not in excluded]
+
+    return load
+
+# Кэши таблиц категорий, таблицы лидеров и случайный выбор - по одному на раздел
+_section_categories = {
+    key: CategoryCache(_category_loader(key))
+    for key, spec in SECTIONS.items() if spec.category and spec.category.table
+}
+_section_leaderboards = {key: Leaderboard(_leaderboard_loader(key)) for key, spec in SECTIONS.items() if spec.rated}
+_section_random = {
+    key: RandomPicker(_random_loader(key), history=RANDOM_HISTORY)
+    for key, spec in SECTIONS.items() if spec.random_button
+}
+
+def _random_excluded(key: str) -> set:
+    """Category values (ids or texts) never offered by the random pick."""
+    spec = SECTIONS[key]
+    if not spec.random_exclude or spec.category is None:
+        return set()
+    if not spec.category.table:
+        return set(spec.random_exclude)
+    categories = _section_categories[key]
+    return {row['id'] for row in map(categories.by_name, spec.random_exclude) if row}
+
+def _board_category(spec: SectionSpec, row: sqlite3.Row):
+    """Category of a record in the leaderboards; an empty genre is no category."""
+    if spec.category is None:
+        return None
+    return row[spec.category.column] or None
+
+def get_section_items(key: str, status: Any = None, category: Any = None,
+                      page: int = 0, per_page: int = PAGE_SIZE) -> Page:
+    """Get one page of a section's records, optionally only with ``status`` and ``category``.
+
+    ``category`` is a category id or, for text categories, the text.
+    """
+    spec = SECTIONS[key]
+    conditions, params = [], ()
+    if status is not None:
+        conditions.append(f"{spec.status_column} = ?")
+        params += (status,)
+    if category is not None:
+        conditions.append(f"{spec.category.column} = ?")
+        params += (category,)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return _fetch_page(spec.table, where, params, spec.order_by, page, per_page)
+
+def get_section_item(key: str, item_id: int) -> Optional[sqlite3.Row]:
+    """Get a record with its category name, average rating and video cache in one query."""
+    return _fetchone(_section_sql[key]['get'], (item_id,))
+
+def add_section_item(key: str, values: Dict[str, Any]) -> int:
+    """Add a record; ``values`` maps field names (and the category column) to values, missing are NULL."""
+    spec = SECTIONS[key]
+    item_id = _execute(_section_sql[key]['insert'], tuple(values.get(column) for column in _insert_columns(spec)))
+    picker = _section_random.get(key)
+    if picker is not None:
+        category = values.get(spec.category.column) if spec.category else None
+        if category not in _random_excluded(key):
+            picker.add(item_id)
+    return item_id
+
+def update_section_item(key: str, item_id: int, values: Dict[str, Optional[str]]):
+    """Update a record; fields that are None or missing keep their value."""
+    spec = SECTIONS[key]
+    params = tuple(values.get(field.name) for field in spec.fields if not field.video)
+    if not any(value is not None for value in params):
+        return
+    _execute(_section_sql[key]['update'], params + (item_id,))
+    board = _section_leaderboards.get(key)
+    if board is not None and spec.category and values.get(spec.category.column) is not None:
+        # Текстовая категория (жанр) - категория в таблице лидеров
+        row = get_section_item(key, item_id)
+        if row and row[spec.status_column] == spec.done_status:
+            board.update(item_id, _board_category(spec, row), row['user1_rating'], row['user2_rating'])
+
+def set_section_item_status(key: str, item_id: int, status: Any,
+                            user1_rating: Optional[int] = None, user2_rating: Optional[int] = None):
+    """Set the status of a record; ratings are written with the done status of rated sections."""
+    spec = SECTIONS[key]
+    board = _section_leaderboards.get(key)
+    if board is not None and status == spec.done_status:
+        _execute(_section_sql[key]['rate'], (status, user1_rating, user2_rating, item_id))
+        row = get_section_item(key, item_id)
+        if row:
+            board.update(item_id, _board_category(spec, row), user1_rating, user2_rating)
     else:
-        cursor.execute(
-            """SELECT *, (COALESCE(user1_rating, 0) + COALESCE(user2_rating, 0)) / 2.0 as avg_rating
-               FROM games WHERE status = 'done' 
-               AND (user1_rating IS NOT NULL OR user2_rating IS NOT NULL)
-               ORDER BY avg_rating DESC LIMIT 10"""
-        )
-    
-    results = cursor.fetchall()
-    conn.close()
-    return results
-
-# Sexual operations
-def add_sexual(title: str, link: Optional[str], description: Optional[str]) -> int:
-    """Add a new sexual entry."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO sexual (title, link, description) VALUES (?, ?, ?)",
-        (title, link, description)
+        _execute(_section_sql[key]['status'], (status, item_id))
+    picker = _section_random.get(key)
+    if picker is not None and spec.statuses and status != spec.statuses[0].value:
+        picker.discard(item_id)
+
+def delete_section_item(key: str, item_id: int):
+    """Delete a record (and its cached video)."""
+    queries = _section_sql[key]
+    with _pool.writer() as conn:
+        if 'media_delete' in queries:
+            _execute(queries['media_delete'], (item_id,), conn)
+        _execute(queries['delete'], (item_id,), conn)
+    if key in _section_random:
+        _section_random[key].discard(item_id)
+    if key in _section_leaderboards:
+        _section_leaderboards[key].discard(item_id)
+
+def get_random_section_item(key: str, weighted: bool = False) -> Optional[sqlite3.Row]:
+    """Get a random record with the first status, skipping the last RANDOM_HISTORY picks while possible.
+
+    ``weighted`` favours records that have been waiting longer.
+    """
+    item_id = _section_random[key].pick(weighted)
+    return get_section_item(key, item_id) if item_id is not None else None
+
+def get_section_top(key: str, user_num: Optional[int] = None, category: Any = None,
+                    limit: int = 10) -> List[sqlite3.Row]:
+    """Get the best rated records, by average or by one user's rating, optionally in one category."""
+    ids = [item_id for item_id, _ in _section_leaderboards[key].top(user_num, category, limit)]
+    return _fetch_rated(SECTIONS[key].table, ids)
+
+def get_section_categories(key: str, status: Any = None) -> List[sqlite3.Row]:
+    """Categories of a section: rows of its category table (cached) or distinct texts.
+
+    Text categories are taken from records with ``status``.
+    """
+    if key in _section_categories:
+        return _section_categories[key].all()
+    return _fetchall(_section_sql[key]['categories'], (status,) if SECTIONS[key].statuses else ())
+
+def get_section_category_by_name(key: str, name: str) -> Optional[sqlite3.Row]:
+    """Get a category from the category table of a section by name (cached)."""
+    return _section_categories[key].by_name(name)
+
+def add_section_category(key: str, name: str) -> int:
+    """Add a category to the category table of a section."""
+    category_id = _execute(_section_sql[key]['add_category'], (name,))
+    _section_categories[key].invalidate()
+    if key in _section_random:
+        # Новая категория может оказаться исключённой из случайного выбора
+        _section_random[key].invalidate()
+    return category_id
+
+def get_category_cache_stats() -> dict:
+    """Hit/miss counters of the category caches, by category table."""
+    return {SECTIONS[key].category.table: cache.stats() for key, cache in _section_categories.items()}
+
+# Video cache of sections with media
+def save_section_media(key: str, item_id: int, file_id: str, file_unique_id: Optional[str] = None,
+                       duration: Optional[int] = None, file_size: Optional[int] = None,
+                       thumbnail_file_id: Optional[str] = None):
+    """Store (or refresh) the video of a record; missing metadata keeps the old values."""
+    queries = _section_sql[key]
+    with _pool.writer() as conn:
+        _execute(queries['media_save'],
+                 (item_id, file_id, file_unique_id, duration, file_size, thumbnail_file_id), conn)
+        _execute(queries['media_column'], (file_id, item_id), conn)
+
+def get_section_media_to_check(key: str, limit: int) -> List[sqlite3.Row]:
+    """Videos (item_id, file_id) checked longest ago (never checked first)."""
+    return _fetchall(_section_sql[key]['media_check'], (limit,))
+
+def set_section_media_status(key: str, item_id: int, status: str):
+    """Record the result of a file_id check ('ok' or 'broken')."""
+    _execute(_section_sql[key]['media_status'], (status, item_id))
+
+# Full-text search
+_SEARCH_SECTIONS = {code: table for table, (code, _, _) in SEARCH_SOURCES.items()}
+
+def _search_match(text: str) -> Optional[str]:
+    """Build an FTS5 query: every word must match as a prefix."""
+    words = re.findall(r"\w+", text.lower().replace('ё', 'е'))
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+def search(text: str, section: Optional[str] = None, limit: int = SEARCH_LIMIT) -> List[SearchResult]:
+    """Search titles, notes, descriptions and genres; best matches first.
+
+    ``section`` is a table name from migrations.SEARCH_SOURCES.
+    """
+    match = _search_match(text)
+    if not match:
+        return []
+    where = "search_index MATCH ?"
+    params: tuple = (match,)
+    if section:
+        where += " AND rowid % ? = ?"
+        params += (SEARCH_ROWID_FACTOR, SEARCH_SOURCES[section][0])
+    # Совпадение в заголовке весит больше, чем в примечании
+    rows = _fetchall(
+        f"""SELECT rowid, label FROM search_index WHERE {where}
+            ORDER BY bm25(search_index, 0.0, 10.0, 1.0) LIMIT ?""",
+        params + (limit,)
     )
-    entry_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return entry_id
-
-def get_sexual_all() -> List[sqlite3.Row]:
-    """Get all sexual entries."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM sexual ORDER BY id DESC")
-    results = cursor.fetchall()
-    conn.close()
-    return results
-
-def get_sexual(entry_id: int) -> Optional[sqlite3.Row]:
-    """Get a single sexual entry."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM sexual WHERE id = ?", (entry_id,))
-    result = cursor.fetchone()
-    conn.close()
-    return result
-
-# Функции для категорий удалены - Sexual теперь без категорий
-
+    return [
+        SearchResult(_SEARCH_SECTIONS[row[0] % SEARCH_ROWID_FACTOR], row[0] // SEARCH_ROWID_FACTOR, row[1])
+        for row in rows
+    ]
+
+# Bot state persistence
+def get_persisted_user_data() -> Dict[int, dict]:
+    """Load saved user_data of every user."""
+    rows = _fetchall("SELECT user_id, data FROM bot_user_data")
+    return {row['user_id']: json.loads(row['data']) for row in rows}
+
+def get_persisted_conversations(name: str) -> Dict[tuple, Any]:
+    """Load saved states of one ConversationHandler."""
+    rows = _fetchall("SELECT key, state FROM bot_conversations WHERE name = ?", (name,))
+    return {tuple(json.loads(row['key'])): json.loads(row['state']) for row in rows}
+
+def save_persisted_state(user_data: Dict[int, Optional[str]],
+                         conversations: Dict[Tuple[str, tuple], Any]):
+    """Write a batch of state changes in one transaction.
+
+    ``user_data`` maps user ids to serialized JSON (None deletes the row);
+    ``conversations`` maps (name, key) to the new state (None ends it).
+    """
+    with _pool.writer() as conn:
+        for user_id, data in user_data.items():
+            if data is None:
+                _execute("DELETE FROM bot_user_data WHERE user_id = ?", (user_id,), conn)
+            else:
+                _execute(
+                    "INSERT OR REPLACE INTO bot_user_data (user_id, data) VALUES (?, ?)",
+                    (user_id, data), conn
+                )
+        for (name, key), state in conversations.items():
+            if state is None:
+                _execute("DELETE FROM bot_conversations WHERE name = ? AND key = ?",
+                         (name, json.dumps(key)), conn)
+            else:
+                _execute(
+                    "INSERT OR REPLACE INTO bot_conversations (name, key, state) VALUES (?, ?, ?)",
+                    (name, json.dumps(key), json.dumps(state)), conn
+                )
@@ -0,0 +1,152 @@
+"""SQLite connection pool: one long-lived writer plus a bounded set of readers."""
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from queue import Queue, Empty
+from typing import Dict, Iterator, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Размер LRU-кэша скомпилированных выражений на каждое соединение
+STATEMENT_CACHE_SIZE = 256
+
+# Профиль соединения по умолчанию; переопределяется секцией "database" в config.json
+DEFAULT_PRAGMAS: Dict[str, Union[str, int]] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -8000,        # отрицательное значение - размер в КиБ
+    "mmap_size": 64 * 1024 * 1024,
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,       # мс
+}
+
+_PRAGMA_CHOICES = {
+    "journal_mode": {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"},
+    "synchronous": {"OFF", "NORMAL", "FULL", "EXTRA", "0", "1", "2", "3"},
+    "temp_store": {"DEFAULT", "FILE", "MEMORY", "0", "1", "2"},
+}
+_PRAGMA_INTS = {"cache_size", "mmap_size", "busy_timeout"}
+
+def build_pragmas(overrides: Optional[Dict[str, Union[str, int]]] = None) -> Dict[str, Union[str, int]]:
+    """Merge overrides into the default profile and validate every value."""
+    pragmas = dict(DEFAULT_PRAGMAS)
+    pragmas.update(overrides or {})
+    for name, value in pragmas.items():
+        if name in _PRAGMA_INTS:
+            pragmas[name] = int(value)
+        elif name in _PRAGMA_CHOICES:
+            value = str(value).upper()
+            if value not in _PRAGMA_CHOICES[name]:
+                raise ValueError(f"Invalid value for PRAGMA {name}: {value}")
+            pragmas[name] = value
+        else:
+            raise ValueError(f"Unsupported PRAGMA: {name}")
+    return pragmas
+
+class ConnectionPool:
+    """Bounded pool of persistent SQLite connections.
+
+    Writes go through a single connection guarded by a lock, so the bot never
+    races itself for the database file. Reads borrow one of ``readers``
+    connections, created lazily on first use.
+    """
+
+    def __init__(self, db_path: Path, readers: int = 3,
+                 pragmas: Optional[Dict[str, Union[str, int]]] = None):
+        self.db_path = db_path
+        self.max_readers = readers
+        self.pragmas = build_pragmas(pragmas)
+        self._idle: Queue = Queue()
+        self._created = 0
+        self._all: List[sqlite3.Connection] = []
+        self._writer = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.RLock()
+        self._closed = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection and apply the pragma profile."""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.pragmas["busy_timeout"] / 1000,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        conn.row_factory = sqlite3.Row
+        # busy_timeout первым, чтобы смена journal_mode тоже ждала блокировку
+        conn.execute(f"PRAGMA busy_timeout = {self.pragmas['busy_timeout']}")
+        for name, value in self.pragmas.items():
+            if name != "busy_timeout":
+                conn.execute(f"PRAGMA {name} = {value}")
+        self._all.append(conn)
+        return conn
+
+    def _acquire_reader(self) -> sqlite3.Connection:
+        """Take an idle reader, opening a new one while under the limit."""
+        if self._closed:
+            raise sqlite3.ProgrammingError("Connection pool is closed")
+        try:
+            return self._idle.get_nowait()
+        except Empty:
+            pass
+        with self._lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Connection pool is closed")
+            if self._created < self.max_readers:
+                self._created += 1
+                return self._connect()
+        return self._idle.get()
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a read connection for the duration of the block."""
+        conn = self._acquire_reader()
+        try:
+            yield conn
+        finally:
+            # Не оставлять открытую транзакцию чтения на возвращаемом соединении
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put(conn)
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """Hold the write connection; commit on success, roll back on error."""
+        with self._write_lock:
+            if self._writer is None:
+                with self._lock:
+                    if self._closed:
+                        raise sqlite3.ProgrammingError("Connection pool is closed")
+                    self._writer = self._connect()
+            conn = self._writer
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
+
+    def checkpoint(self, mode: str = "PASSIVE") -> Optional[sqlite3.Row]:
+        """Run wal_checkpoint on the writer; returns (busy, log, checkpointed)."""
+        if mode not in ("PASSIVE", "FULL", "RESTART", "TRUNCATE"):
+            raise ValueError(f"Invalid checkpoint mode: {mode}")
+        with self.writer() as conn:
+            return conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+
+    def close(self):
+        """Close every connection opened by the pool."""
+        with self._write_lock, self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            for conn in self._all:
+                try:
+                    conn.close()
+                except sqlite3.Error as e:
+                    logger.warning(f"Error closing connection: {e}")
+            self._all.clear()
+            self._writer = None
+        logger.info("Database connections closed")
@@ -0,0 +1,107 @@
+"""Search handlers."""
+import logging
+from telegram import (
+    Update, InlineKeyboardButton, InlineKeyboardMarkup,
+    InlineQueryResultArticle, InputTextMessageContent
+)
+from telegram.ext import ContextTypes, CommandHandler, InlineQueryHandler
+from async_database import search, get_section_items
+from models import SectionSpec
+from sections import SECTIONS
+from ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Таблица полнотекстового индекса -> описание раздела
+_SPECS_BY_TABLE = {spec.table: spec for spec in SECTIONS.values()}
+
+# Inline-режим: разделы (ключи SECTIONS), время жизни кэша результатов и подсказка cache_time для Telegram
+INLINE_SECTIONS = ('movies', 'games', 'trips')
+INLINE_RESULTS_PER_SECTION = 10
+INLINE_CACHE_TTL = 30
+INLINE_CACHE_TIME = 10
+
+# (раздел, нормализованный запрос) -> готовые InlineQueryResultArticle
+_inline_cache = TTLCache(ttl=INLINE_CACHE_TTL)
+
+def _section_name(spec: SectionSpec) -> str:
+    """Section name as on the main menu button, without the emoji."""
+    return spec.menu_button.replace(spec.emoji, "", 1).strip()
+
+def _article(spec: SectionSpec, item_id: int, title: str, description: str) -> InlineQueryResultArticle:
+    return InlineQueryResultArticle(
+        id=f"{spec.key}:{item_id}",
+        title=f"{spec.emoji} {title}",
+        description=description,
+        input_message_content=InputTextMessageContent(f"{spec.emoji} {title}")
+    )
+
+async def _section_articles(section: str, text: str) -> list:
+    """Inline results for one section, served from the TTL cache when possible."""
+    key = (section, text)
+    articles = _inline_cache.get(key)
+    if articles is not None:
+        return articles
+
+    spec = SECTIONS[section]
+    section_name = _section_name(spec)
+    if text:
+        results = await search(text, section=spec.table, limit=INLINE_RESULTS_PER_SECTION)
+        articles = [_article(spec, r.item_id, r.title, section_name) for r in results]
+    else:
+        # Пустой запрос: последние записи первого статуса (ещё не выполненные)
+        status = spec.statuses[0].value if spec.statuses else None
+        page = await get_section_items(section, status=status, per_page=INLINE_RESULTS_PER_SECTION)
+        title_field, *fields = spec.fields
+        articles = [
+            _article(spec, row['id'], row[title_field.name],
+                     next((row[f.name] for f in fields if not f.video and row[f.name]), section_name))
+            for row in page.items
+        ]
+    _inline_cache.set(key, articles)
+    return articles
+
+def _results_keyboard(results) -> InlineKeyboardMarkup:
+    """One button per hit, leading to the item's detail screen."""
+    keyboard = []
+    for result in results:
+        spec = _SPECS_BY_TABLE[result.section]
+        keyboard.append([InlineKeyboardButton(
+            f"{spec.emoji} {result.title}", callback_data=f"{spec.prefix}:{result.item_id}"
+        )])
+    keyboard.append([InlineKeyboardButton("🔙 Главное меню", callback_data="main_menu")])
+    return InlineKeyboardMarkup(keyboard)
+
+async def search_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /search <text>."""
+    text = " ".join(context.args)
+    if not text:
+        await update.message.reply_text("🔍 Использование: /search текст")
+        return
+
+    results = await search(text)
+    if not results:
+        await update.message.reply_text(f"🔍 По запросу «{text}» ничего не найдено")
+        return
+
+    await update.message.reply_text(
+        f"🔍 Результаты по запросу «{text}»:",
+        reply_markup=_results_keyboard(results)
+    )
+
+async def search_inline(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Answer @bot <text> inline queries with movies, games and trips."""
+    query = update.inline_query
+    text = " ".join(query.query.lower().split())
+    articles = []
+    for section in INLINE_SECTIONS:
+        articles.extend(await _section_articles(section, text))
+    # Telegram принимает не больше 50 результатов
+    await query.answer(articles[:50], cache_time=INLINE_CACHE_TIME, is_personal=True)
+
+def get_search_handlers():
+    """Get all search handlers."""
+    return [
+        CommandHandler("search", search_command),
+        InlineQueryHandler(search_inline),
+    ]
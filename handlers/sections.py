@@ -0,0 +1,739 @@
+"""Handlers of the list sections described in sections.py."""
+import hashlib
+import logging
+import re
+from typing import Any, List, Optional, Tuple
+
+from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, InputMediaVideo, Message
+from telegram.error import BadRequest
+from telegram.ext import ContextTypes, ConversationHandler, MessageHandler, CallbackQueryHandler, filters
+from async_database import (
+    get_section_items, get_section_item, add_section_item, update_section_item,
+    set_section_item_status, delete_section_item, get_random_section_item, get_section_top,
+    get_section_categories, get_section_category_by_name, add_section_category,
+    save_section_media, get_section_media_to_check, set_section_media_status
+)
+from callback_router import Route
+from config import USER_DISPLAY_NAMES, USER_IDS, USERS
+from keyboards import (
+    registry, page_keyboard, split_page_callback, cancel_keyboard,
+    category_selection_keyboard, rating_keyboard
+)
+from models import SectionSpec, SectionStatus
+from sections import SECTIONS
+
+logger = logging.getLogger(__name__)
+
+# Видео больше этого размера сначала показываются превью, затем заменяются на само видео
+LARGE_VIDEO_SIZE = 5 * 1024 * 1024
+# Фоновая проверка file_id: период (сек) и сколько видео проверять за раз
+MEDIA_CHECK_INTERVAL = 6 * 60 * 60
+MEDIA_CHECK_BATCH = 20
+TOP_SIZE = 10
+
+def _category_key(value: Any) -> str:
+    """Short stable key of a category (id or text) for callback_data.
+
+    Telegram limits callback_data to 64 bytes. A Cyrillic genre name with
+    the ``:page:N`` suffix would exceed that, so texts are hashed.
+    """
+    if isinstance(value, int):
+        return str(value)
+    return hashlib.blake2s(value.encode(), digest_size=4).hexdigest()
+
+def _media_info(message: Message) -> Optional[dict]:
+    """file_id and metadata of the video (or video document) in a message."""
+    media = message.video or message.document
+    if not media:
+        return None
+    return {
+        'file_id': media.file_id,
+        'file_unique_id': media.file_unique_id,
+        'duration': getattr(media, 'duration', None),
+        'file_size': media.file_size,
+        'thumbnail_file_id': media.thumbnail.file_id if media.thumbnail else None,
+    }
+
+async def _delete_callback_message(query):
+    """Delete the message with the pressed button; messages that cannot be deleted stay."""
+    try:
+        await query.delete_message()
+    except BadRequest as e:
+        # Сообщения старше 48 часов или уже удалённые удалить нельзя - это не ошибка видео
+        logger.debug(f"Could not delete message: {e}")
+
+def _user_name(index: int) -> str:
+    return USER_DISPLAY_NAMES.get(USER_IDS[index], f"Пользователь {index + 1}")
+
+class SectionHandlers:
+    """Menu, lists, card, tops and add/edit/done/rate/delete actions of one section.
+
+    Everything is derived from the spec: callbacks, conversation states,
+    user_data keys (``<name>_<field>``) and keyboards. Conversation
+    states are numbered add dialog first (one state per field, then the
+    category keyboard and the new category name), then the edit dialog,
+    then the two ratings. Static menus are built once, item and status
+    keyboards are cached by the keyboard registry.
+    """
+
+    def __init__(self, spec: SectionSpec):
+        self.spec = spec
+        # Префикс в метриках: у всех разделов одинаковые имена методов
+        self.metrics_prefix = spec.key
+        category = spec.category
+        self.category_table = bool(category and category.table)
+        self.filters = {f.key: f for f in category.filters} if category else {}
+        self.statuses = {status.callback: status for status in spec.statuses}
+        self.status_keys = {status.value: status.callback for status in spec.statuses}
+        self.edit_fields = [field for field in spec.fields if not field.video]
+        self.add_states = len(spec.fields) + (2 if self.category_table else 0)
+        self.rating_state = self.add_states + len(self.edit_fields)
+
+        self.menu_keyboard = registry.static(self._build_menu_keyboard, name=f"{spec.key}_menu_keyboard")
+        self.status_keyboard = registry.cached(self._build_status_keyboard, name=f"{spec.key}_status_keyboard")
+        self.detail_keyboard = registry.cached(self._build_detail_keyboard, name=f"{spec.name}_detail_keyboard")
+        if spec.rated:
+            self.top_keyboard = registry.static(self._build_top_keyboard, name=f"{spec.key}_top_keyboard")
+
+    # Клавиатуры
+    def _build_menu_keyboard(self) -> InlineKeyboardMarkup:
+        spec = self.spec
+        keyboard = [
+            [InlineKeyboardButton(status.button, callback_data=f"{spec.key}:{status.callback}")]
+            for status in spec.statuses
+        ]
+        if not spec.statuses:
+            keyboard.extend(
+                [InlineKeyboardButton(f.button, callback_data=f"{spec.key}:{f.key}")]
+                for f in self.filters.values()
+            )
+        if spec.random_button:
+            keyboard.append([InlineKeyboardButton(spec.random_button, callback_data=f"{spec.key}:random")])
+        keyboard.append([InlineKeyboardButton(spec.add_button, callback_data=f"{spec.key}:add")])
+        keyboard.append([InlineKeyboardButton("🔙 Главное меню", callback_data="main_menu")])
+        return InlineKeyboardMarkup(keyboard)
+
+    def _build_status_keyboard(self, status_key: str,
+                               categories: Tuple[Tuple[str, str], ...] = ()) -> InlineKeyboardMarkup:
+        """Submenu of a status: whole list, lists per category ((name, key) pairs) and the top."""
+        spec = self.spec
+        base = f"{spec.key}:{status_key}"
+        status = self.statuses[status_key]
+        keyboard = [[InlineKeyboardButton("📋 Общий список", callback_data=f"{base}:all")]]
+        if status.by_category:
+            keyboard.extend(
+                [InlineKeyboardButton(f.button, callback_data=f"{base}:{f.key}")]
+                for f in self.filters.values()
+            )
+            keyboard.extend(
+                [InlineKeyboardButton(f"🏷️ {name}", callback_data=f"{base}:cat:{key}")]
+                for name, key in categories
+            )
+        if self._has_top(status):
+            keyboard.append([InlineKeyboardButton("🏆 Топ-10", callback_data=f"{base}:top")])
+        keyboard.append([InlineKeyboardButton("🔙 Назад", callback_data=f"{spec.key}:menu")])
+        return InlineKeyboardMarkup(keyboard)
+
+    def _build_top_keyboard(self) -> InlineKeyboardMarkup:
+        spec = self.spec
+        keyboard = [[InlineKeyboardButton("🏆 Общий топ", callback_data=f"{spec.key}:top:all")]]
+        # Кнопки для каждого пользователя
+        for num, user in enumerate(USERS[:2], 1):
+            name = user.get('display_name', f"Пользователь {num}")
+            keyboard.append([InlineKeyboardButton(f"👤 Топ {name}", callback_data=f"{spec.key}:top:user{num}")])
+        done_key = self.status_keys.get(spec.done_status)
+        back = f"{spec.key}:{done_key}" if done_key else f"{spec.key}:menu"
+        keyboard.append([InlineKeyboardButton("🔙 Назад", callback_data=back)])
+        return InlineKeyboardMarkup(keyboard)
+
+    def _build_detail_keyboard(self, item_id: int, done: bool, back: str) -> InlineKeyboardMarkup:
+        spec = self.spec
+        prefix = f"{spec.prefix}:{item_id}"
+        keyboard = []
+        if spec.done_status is not None and not done:
+            keyboard.append([InlineKeyboardButton(spec.done_button, callback_data=f"{prefix}:{spec.done_action}")])
+        if spec.editable:
+            keyboard.append([InlineKeyboardButton("✏️ Редактировать", callback_data=f"{prefix}:edit")])
+        if spec.deletable:
+            keyboard.append([InlineKeyboardButton("🗑️ Удалить", callback_data=f"{prefix}:delete")])
+        keyboard.append([InlineKeyboardButton("🔙 Назад", callback_data=back)])
+        return InlineKeyboardMarkup(keyboard)
+
+    # Записи
+    def _has_submenu(self, status: SectionStatus) -> bool:
+        return status.by_category or self._has_top(status)
+
+    def _has_top(self, status: SectionStatus) -> bool:
+        return self.spec.rated and status.value == self.spec.done_status
+
+    def _done(self, item) -> bool:
+        return self.spec.done_status is not None and item[self.spec.status_column] == self.spec.done_status
+
+    def _back(self, item) -> str:
+        """Callback of the "Назад" button of a card: the list of its status or category."""
+        spec = self.spec
+        if spec.statuses:
+            status_key = self.status_keys.get(item[spec.status_column])
+            return f"{spec.key}:{status_key}" if status_key else f"{spec.key}:menu"
+        if self.filters:
+            category = item['category_name'] if self.category_table else item[spec.category.column]
+            for f in self.filters.values():
+                if f.category == category:
+                    return f"{spec.key}:{f.key}"
+        return f"{spec.key}:menu"
+
+    def _item_keyboard(self, item) -> InlineKeyboardMarkup:
+        return self.detail_keyboard(item['id'], self._done(item), self._back(item))
+
+    def _card(self, item) -> str:
+        """Item text: title line, one line per filled field, category and rating."""
+        spec = self.spec
+        title_field, *fields = spec.fields
+        lines = [f"{spec.emoji} {item[title_field.name]}"]
+        lines.extend(f"{field.emoji} {item[field.name]}" for field in fields if not field.video and item[field.name])
+        if self.category_table and item['category_name']:
+            lines.append(f"🏷️ {item['category_name']}")
+        if spec.rated and self._done(item) and item['avg_rating']:
+            lines.append(f"⭐ {item['avg_rating']}/10")
+        return "\n".join(lines)
+
+    # Представления
+    async def _menu_view(self, page_num: int = 0) -> Tuple[str, InlineKeyboardMarkup]:
+        """Text and keyboard of the section menu (the list itself for sections without statuses or filters)."""
+        spec = self.spec
+        if spec.statuses or self.filters:
+            return spec.title, self.menu_keyboard()
+        items = await get_section_items(spec.key, page=page_num)
+        if not items.total:
+            return f"{spec.title}\n\n{spec.empty_text}", self.menu_keyboard()
+        base_keyboard = page_keyboard(items, spec.prefix, f"{spec.key}:menu")
+        keyboard = InlineKeyboardMarkup(tuple(base_keyboard.inline_keyboard) + self.menu_keyboard().inline_keyboard)
+        return f"{spec.title}\n\n{spec.choose_text}", keyboard
+
+    async def _status_view(self, status: SectionStatus) -> Tuple[str, InlineKeyboardMarkup]:
+        """Text and keyboard of a status submenu; categories without fixed filters are read from the database."""
+        spec = self.spec
+        categories = ()
+        if status.by_category and spec.category and not self.filters:
+            rows = await get_section_categories(spec.key, status.value)
+            categories = tuple(
+                (row['name'], _category_key(row['id'] if self.category_table else row['name'])) for row in rows
+            )
+        return status.title or status.button, self.status_keyboard(status.callback, categories)
+
+    @staticmethod
+    async def _show(update: Update, text: str, keyboard: Optional[InlineKeyboardMarkup]):
+        """Reply to a message or edit the message of a callback query.
+
+        A message with a video has no text to edit, so a new message is sent instead.
+        """
+        query = update.callback_query
+        if query is None:
+            await update.message.reply_text(text, reply_markup=keyboard)
+        elif query.message is not None and query.message.text is None:
+            await query.message.reply_text(text, reply_markup=keyboard)
+        else:
+            await query.edit_message_text(text, reply_markup=keyboard)
+
+    def _item_id(self, query) -> int:
+        return int(query.data.split(":")[1])
+
+    async def _category_value(self, parts: List[str], status: Any) -> Any:
+        """Category id or text of a list callback (``<filter>`` or ``cat:<key>``); None if unknown."""
+        spec = self.spec
+        if parts[0] == "cat" and len(parts) == 2:
+            for row in await get_section_categories(spec.key, status):
+                value = row['id'] if self.category_table else row['name']
+                if _category_key(value) == parts[1]:
+                    return value
+            return None
+        category_filter = self.filters.get(parts[0])
+        if category_filter is None:
+            return None
+        if not self.category_table:
+            return category_filter.category
+        row = await get_section_category_by_name(spec.key, category_filter.category)
+        return row['id'] if row else None
+
+    # Просмотр
+    async def menu(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Show the section menu."""
+        page_num = 0
+        if update.callback_query:
+            await update.callback_query.answer()
+            page_num = split_page_callback(update.callback_query.data)[1]
+        text, keyboard = await self._menu_view(page_num)
+        await self._show(update, text, keyboard)
+
+    async def status_menu(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Show the submenu of a status."""
+        query = update.callback_query
+        await query.answer()
+        text, keyboard = await self._status_view(self.statuses[query.data.split(":")[1]])
+        await self._show(update, text, keyboard)
+
+    async def item_list(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Show records with one status and/or category.
+
+        Callbacks: ``<key>:<status>`` (status without submenu),
+        ``<key>:<status>:all|<filter>|cat:<category>`` and ``<key>:<filter>``.
+        """
+        spec = self.spec
+        query = update.callback_query
+        await query.answer()
+
+        base, page_num = split_page_callback(query.data)
+        parts = base.split(":")[1:]
+        status = None
+        parent = f"{spec.key}:menu"
+        if spec.statuses:
+            status = self.statuses[parts.pop(0)]
+            if self._has_submenu(status):
+                parent = f"{spec.key}:{status.callback}"
+
+        async def parent_view():
+            return await self._status_view(status) if parent != f"{spec.key}:menu" else await self._menu_view()
+
+        category = None
+        if parts and parts[0] != "all":
+            category = await self._category_value(parts, status.value if status else None)
+            if category is None:
+                # Категории больше нет среди записей - вернуться к меню выше
+                await self._show(update, *await parent_view())
+                return
+
+        items = await get_section_items(spec.key, status=status.value if status else None,
+                                        category=category, page=page_num)
+        if not items.total:
+            _, keyboard = await parent_view()
+            await self._show(update, spec.empty_text, keyboard)
+            return
+
+        await self._show(
+            update, spec.choose_text,
+            page_keyboard(items, spec.prefix, base, back_button="🔙 Назад", back_callback=parent)
+        )
+
+    async def top_menu(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Show the top-10 submenu."""
+        await update.callback_query.answer()
+        await self._show(update, self.spec.top_title, self.top_keyboard())
+
+    async def top_list(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Show the top-10 by average rating or by one user's rating."""
+        query = update.callback_query
+        await query.answer()
+
+        user_num = {"user1": 1, "user2": 2}.get(query.data.split(":")[-1])
+        items = await get_section_top(self.spec.key, user_num, limit=TOP_SIZE)
+        if not items:
+            await self._show(update, self.spec.empty_text, self.top_keyboard())
+            return
+
+        lines = ["🏆 Топ-10:\n"]
+        for i, item in enumerate(items, 1):
+            rating = item[f'user{user_num}_rating'] if user_num else f"{item['avg_rating']:.1f}"
+            lines.append(f"{i}. {item['title']} - {rating}/10")
+        await self._show(update, "\n".join(lines), self.top_keyboard())
+
+    async def random(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Show a random record with the first status."""
+        spec = self.spec
+        await update.callback_query.answer()
+
+        item = await get_random_section_item(spec.key, weighted=spec.random_weighted)
+        if not item:
+            await self._show(update, spec.random_empty_text, self.menu_keyboard())
+            return
+        await self._show(update, f"{spec.random_title}\n\n{self._card(item)}", self._item_keyboard(item))
+
+    async def detail(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Show a record (with its video for sections with media)."""
+        query = update.callback_query
+        await query.answer()
+
+        item = await get_section_item(self.spec.key, self._item_id(query))
+        if not item:
+            await self._show(update, self.spec.not_found_text, None)
+            return
+        if self.spec.media:
+            await self._send_media(update, item)
+            return
+        await self._show(update, self._card(item), self._item_keyboard(item))
+
+    # Видео
+    async def _send_media(self, update: Update, item):
+        """Send the card as a video; the cached file_id is refreshed from the sent message."""
+        spec = self.spec
+        query = update.callback_query
+        text, keyboard = self._card(item), self._item_keyboard(item)
+        video = next(field.name for field in spec.fields if field.video)
+        file_id = item['file_id'] or item[video]
+
+        if not file_id:
+            await self._show(update, text, keyboard)
+            return
+        if item['media_status'] == 'broken':
+            # Фоновая проверка уже нашла, что file_id не работает
+            await self._show(update, f"{text}\n\n⚠️ Видео недоступно", keyboard)
+            return
+
+        preview = None
+        if item['thumbnail_file_id'] and (item['file_size'] or 0) > LARGE_VIDEO_SIZE:
+            # Превью приходит сразу, видео заменяет его в том же сообщении
+            try:
+                preview = await query.message.reply_photo(
+                    photo=item['thumbnail_file_id'],
+                    caption=f"{text}\n\n⏳ Загрузка видео..."
+                )
+            except BadRequest as e:
+                # Сломанное превью не значит, что сломано видео - отправляем его без превью
+                logger.warning(f"Preview of {spec.name} {item['id']} failed: {e}")
+            else:
+                await _delete_callback_message(query)
+
+        try:
+            if preview:
+                sent = await preview.edit_media(InputMediaVideo(file_id, caption=text), reply_markup=keyboard)
+            else:
+                sent = await query.message.reply_video(video=file_id, caption=text, reply_markup=keyboard)
+        except Exception as e:
+            logger.error(f"Error sending video: {e}")
+            if isinstance(e, BadRequest):
+                await set_section_media_status(spec.key, item['id'], 'broken')
+            unavailable = f"{text}\n\n⚠️ Видео недоступно"
+            if preview:
+                await preview.edit_caption(unavailable, reply_markup=keyboard)
+            else:
+                await self._show(update, unavailable, keyboard)
+            return
+
+        if not preview:
+            await _delete_callback_message(query)
+        if isinstance(sent, Message):
+            await self._remember_media(item, sent)
+
+    async def _remember_media(self, item, message: Message):
+        """Refresh the cached file_id and metadata from a message the bot just sent."""
+        info = _media_info(message)
+        if not info:
+            return
+        if (info['file_id'] != item['file_id'] or item['file_unique_id'] is None
+                or item['thumbnail_file_id'] is None and info['thumbnail_file_id']):
+            await save_section_media(self.spec.key, item['id'], **info)
+
+    # Действия
+    async def _show_done(self, update: Update, item_id: int):
+        spec = self.spec
+        item = await get_section_item(spec.key, item_id)
+        if item:
+            await self._show(update, f"{spec.done_text}\n\n{self._card(item)}", self._item_keyboard(item))
+        else:
+            text, keyboard = await self._menu_view()
+            await self._show(update, f"{spec.done_text}\n\n{text}", keyboard)
+
+    async def mark_done(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Move a record to the done status."""
+        query = update.callback_query
+        await query.answer()
+
+        item_id = self._item_id(query)
+        await set_section_item_status(self.spec.key, item_id, self.spec.done_status)
+        await self._show_done(update, item_id)
+
+    async def delete(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Delete a record."""
+        query = update.callback_query
+        await query.answer()
+
+        await delete_section_item(self.spec.key, self._item_id(query))
+        text, keyboard = await self._menu_view()
+        await self._show(update, f"{self.spec.deleted_text}\n\n{text}", keyboard)
+
+    async def cancel(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Cancel current operation."""
+        context.user_data.clear()
+        if update.callback_query:
+            await update.callback_query.answer()
+        text, keyboard = await self._menu_view()
+        await self._show(update, f"Операция отменена\n\n{text}", keyboard)
+        return ConversationHandler.END
+
+    # Оценка обоими пользователями при отметке "выполнено"
+    async def rate_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Start rating a record: ask the first user."""
+        query = update.callback_query
+        await query.answer()
+
+        item_id = self._item_id(query)
+        context.user_data[self._key("id")] = item_id
+        await self._show(update, f"Оценка от {_user_name(0)} (1-10):",
+                         rating_keyboard(item_id, self.spec.prefix, 1))
+        return self.rating_state
+
+    async def rate_first(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Rating of the first user: ask the second one or finish."""
+        query = update.callback_query
+        await query.answer()
+
+        rating = int(query.data.split(":")[-1])
+        if len(USER_IDS) < 2:
+            return await self._finish_rating(update, context, rating, None)
+        context.user_data[self._key("rating1")] = rating
+        await self._show(update, f"Оценка от {_user_name(1)} (1-10):",
+                         rating_keyboard(context.user_data[self._key("id")], self.spec.prefix, 2))
+        return self.rating_state + 1
+
+    async def rate_second(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Rating of the second user: save both."""
+        query = update.callback_query
+        await query.answer()
+
+        rating = int(query.data.split(":")[-1])
+        # Диалоги, сохранённые до перехода на sections.py, хранят первую оценку под ключом rating1
+        rating1 = context.user_data.get(self._key("rating1"), context.user_data.get("rating1"))
+        return await self._finish_rating(update, context, rating1, rating)
+
+    async def _finish_rating(self, update: Update, context: ContextTypes.DEFAULT_TYPE,
+                             rating1: Optional[int], rating2: Optional[int]):
+        item_id = context.user_data[self._key("id")]
+        context.user_data.clear()
+        await set_section_item_status(self.spec.key, item_id, self.spec.done_status, rating1, rating2)
+        await self._show_done(update, item_id)
+        return ConversationHandler.END
+
+    # Диалоги добавления и редактирования
+    def _key(self, field_name: str) -> str:
+        return f"{self.spec.name}_{field_name}"
+
+    async def add_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Start adding a record: ask for the first field."""
+        query = update.callback_query
+        await query.answer()
+        await query.edit_message_text(self.spec.fields[0].prompt, reply_markup=cancel_keyboard())
+        return 0
+
+    def _add_step(self, index: int):
+        """Handler of add state ``index``: store the field, ask the next one, the category or save."""
+        spec = self.spec
+        field = spec.fields[index]
+
+        async def step(update: Update, context: ContextTypes.DEFAULT_TYPE):
+            text = update.message.text
+            if field.video:
+                context.user_data[self._key(field.name)] = _media_info(update.message)
+            elif field.required:
+                context.user_data[self._key(field.name)] = text
+            else:
+                context.user_data[self._key(field.name)] = text if text and text != "/skip" else None
+
+            if index + 1 < len(spec.fields):
+                await update.message.reply_text(spec.fields[index + 1].prompt, reply_markup=cancel_keyboard())
+                return index + 1
+            if self.category_table:
+                categories = await get_section_categories(spec.key)
+                await update.message.reply_text(
+                    spec.category.prompt,
+                    reply_markup=category_selection_keyboard(
+                        [{'id': c['id'], 'name': c['name']} for c in categories], f"{spec.name}_add", add_new=True
+                    )
+                )
+                return len(spec.fields)
+            return await self._save(update, context)
+
+        step.__name__ = f"{spec.name}_add_{field.name}"
+        return step
+
+    async def add_category(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Category chosen from the keyboard (or "new category")."""
+        query = update.callback_query
+        await query.answer()
+
+        if query.data.endswith(":cancel"):
+            return await self.cancel(update, context)
+        if query.data.endswith(":new_cat"):
+            await query.edit_message_text(self.spec.category.new_prompt, reply_markup=cancel_keyboard())
+            return len(self.spec.fields) + 1
+        return await self._save(update, context, int(query.data.split(":")[-1]))
+
+    async def add_new_category(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Name of a new category: create it and save the record in it."""
+        category_id = await add_section_category(self.spec.key, update.message.text)
+        return await self._save(update, context, category_id)
+
+    async def _save(self, update: Update, context: ContextTypes.DEFAULT_TYPE, category_id: Optional[int] = None):
+        spec = self.spec
+        values = {field.name: context.user_data.get(self._key(field.name)) for field in spec.fields}
+        media = None
+        for field in spec.fields:
+            if field.video:
+                media = values[field.name]
+                values[field.name] = media['file_id'] if media else None
+        if category_id is not None:
+            values[spec.category.column] = category_id
+        item_id = await add_section_item(spec.key, values)
+        if media:
+            await save_section_media(spec.key, item_id, **media)
+        context.user_data.clear()
+
+        view_text, keyboard = await self._menu_view()
+        await self._show(update, f"{spec.added_text}\n\n{view_text}", keyboard)
+        return ConversationHandler.END
+
+    async def edit_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Start editing a record: ask for the first field."""
+        query = update.callback_query
+        await query.answer()
+        context.user_data[self._key("id")] = self._item_id(query)
+        await query.edit_message_text(self.edit_fields[0].edit_prompt, reply_markup=cancel_keyboard())
+        return self.add_states
+
+    def _edit_step(self, position: int):
+        """Handler of the edit state of text field ``position``; /skip keeps the current value."""
+        spec = self.spec
+        fields = self.edit_fields
+        field = fields[position]
+
+        async def step(update: Update, context: ContextTypes.DEFAULT_TYPE):
+            text = update.message.text
+            context.user_data[self._key(field.name)] = text if text != "/skip" else None
+
+            if position + 1 < len(fields):
+                await update.message.reply_text(fields[position + 1].edit_prompt, reply_markup=cancel_keyboard())
+                return self.add_states + position + 1
+
+            values = {f.name: context.user_data.get(self._key(f.name)) for f in fields}
+            await update_section_item(spec.key, context.user_data[self._key("id")], values)
+            context.user_data.clear()
+
+            view_text, keyboard = await self._menu_view()
+            await update.message.reply_text(f"{spec.updated_text}\n\n{view_text}", reply_markup=keyboard)
+            return ConversationHandler.END
+
+        step.__name__ = f"{spec.name}_edit_{field.name}"
+        return step
+
+    def routes(self) -> List[Route]:
+        """Callback routes of the section."""
+        spec = self.spec
+        routes = [
+            Route(f"{spec.key}:menu", self.menu, paged=True),
+            Route(f"{spec.prefix}:#", self.detail),
+        ]
+        for status in spec.statuses:
+            base = f"{spec.key}:{status.callback}"
+            if self._has_submenu(status):
+                routes.append(Route(base, self.status_menu))
+                # all, фиксированный фильтр или cat:<ключ>, с :page:N
+                routes.append(Route(f"{base}:*", self.item_list))
+            else:
+                routes.append(Route(base, self.item_list, paged=True))
+            if self._has_top(status):
+                routes.append(Route(f"{base}:top", self.top_menu))
+        if not spec.statuses:
+            for key in self.filters:
+                routes.append(Route(f"{spec.key}:{key}", self.item_list, paged=True))
+        if spec.rated:
+            routes.append(Route(f"{spec.key}:top:*", self.top_list))
+        if spec.random_button:
+            routes.append(Route(f"{spec.key}:random", self.random))
+        if spec.done_status is not None and not spec.rated:
+            routes.append(Route(f"{spec.prefix}:#:{spec.done_action}", self.mark_done))
+        if spec.deletable:
+            routes.append(Route(f"{spec.prefix}:#:delete", self.delete))
+        return routes
+
+    def handlers(self) -> List:
+        """Message handlers and dialogs of the section."""
+        spec = self.spec
+        prefix = re.escape(spec.prefix)
+        fallbacks = [CallbackQueryHandler(self.cancel, pattern="^cancel$")]
+        handlers = [MessageHandler(filters.Regex(f"^{re.escape(spec.menu_button)}$"), self.menu)]
+
+        add_states = {}
+        for index, field in enumerate(spec.fields):
+            if field.video:
+                field_filter = filters.VIDEO | filters.Document.VIDEO
+            else:
+                field_filter = filters.TEXT & ~filters.COMMAND if field.required else filters.TEXT
+            add_states[index] = [MessageHandler(field_filter, self._add_step(index))]
+        if self.category_table:
+            add_states[len(spec.fields)] = [
+                CallbackQueryHandler(self.add_category, pattern=f"^{re.escape(spec.name)}_add:")
+            ]
+            add_states[len(spec.fields) + 1] = [
+                MessageHandler(filters.TEXT & ~filters.COMMAND, self.add_new_category)
+            ]
+        handlers.append(ConversationHandler(
+            name=f"{spec.name}_add",
+            persistent=True,
+            entry_points=[CallbackQueryHandler(self.add_start, pattern=rf"^{spec.key}:add$")],
+            states=add_states,
+            fallbacks=fallbacks
+        ))
+        if spec.editable:
+            handlers.append(ConversationHandler(
+                name=f"{spec.name}_edit",
+                persistent=True,
+                entry_points=[CallbackQueryHandler(self.edit_start, pattern=rf"^{prefix}:\d+:edit$")],
+                states={
+                    self.add_states + position: [MessageHandler(filters.TEXT, self._edit_step(position))]
+                    for position in range(len(self.edit_fields))
+                },
+                fallbacks=fallbacks
+            ))
+        if spec.rated:
+            handlers.append(ConversationHandler(
+                name=f"{spec.name}_rating",
+                persistent=True,
+                entry_points=[CallbackQueryHandler(self.rate_start, pattern=rf"^{prefix}:\d+:{spec.done_action}$")],
+                states={
+                    self.rating_state: [CallbackQueryHandler(self.rate_first, pattern=rf"^{prefix}:\d+:rate:1:\d+$")],
+                    self.rating_state + 1: [
+                        CallbackQueryHandler(self.rate_second, pattern=rf"^{prefix}:\d+:rate:2:\d+$")
+                    ],
+                },
+                fallbacks=fallbacks
+            ))
+        return handlers
+
+_sections = {key: SectionHandlers(spec) for key, spec in SECTIONS.items()}
+
+async def media_check_job(context: ContextTypes.DEFAULT_TYPE):
+    """Check cached file_ids in the background so broken videos are known before a tap."""
+    for key, spec in SECTIONS.items():
+        if spec.media is None:
+            continue
+        broken = 0
+        for media in await get_section_media_to_check(key, MEDIA_CHECK_BATCH):
+            try:
+                await context.bot.get_file(media['file_id'])
+                status = 'ok'
+            except BadRequest as e:
+                # Файлы больше 20 МБ нельзя скачать через Bot API, но file_id при этом рабочий
+                status = 'ok' if "too big" in str(e).lower() else 'broken'
+            except Exception as e:
+                logger.warning(f"Could not check video of {spec.name} {media['item_id']}: {e}")
+                continue
+            broken += status == 'broken'
+            await set_section_media_status(key, media['item_id'], status)
+        if broken:
+            logger.warning(f"Found {broken} unavailable video(s) in {key}")
+
+def section_menus() -> dict:
+    """Section key -> menu handler, for the main menu buttons."""
+    return {key: section.menu for key, section in _sections.items()}
+
+def get_section_handlers():
+    """Get handlers of all sections from sections.py."""
+    handlers = []
+    for section in _sections.values():
+        handlers.extend(section.handlers())
+    return handlers
+
+def get_section_routes():
+    """Get callback routes of all sections from sections.py."""
+    routes = []
+    for section in _sections.values():
+        routes.extend(section.routes())
+    return routes
@@ -0,0 +1,100 @@
+"""In-memory rating leaderboards maintained incrementally."""
+import threading
+from bisect import bisect_left, insort
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+# Ключ таблицы: (пользователь или None для среднего, категория или None для всех)
+_BoardKey = Tuple[Optional[int], Optional[Hashable]]
+
+def _scores(user1_rating: Optional[int], user2_rating: Optional[int]) -> Dict[Optional[int], float]:
+    """Score per board kind; same formulas as the old ORDER BY queries."""
+    scores = {}
+    if user1_rating is not None:
+        scores[1] = user1_rating
+    if user2_rating is not None:
+        scores[2] = user2_rating
+    if scores:
+        scores[None] = ((user1_rating or 0) + (user2_rating or 0)) / 2.0
+    return scores
+
+def _board_keys(kind: Optional[int], category: Optional[Hashable]) -> List[_BoardKey]:
+    """Boards an item belongs to: the overall one and, if any, its category's."""
+    if category is None:
+        return [(kind, None)]
+    return [(kind, None), (kind, category)]
+
+class Leaderboard:
+    """Sorted rating boards: overall average, per user, and per category.
+
+    ``loader`` returns rows with ``id``, ``category``, ``user1_rating`` and
+    ``user2_rating`` for every rated item. Boards are built on first use and
+    then updated by ``update``/``discard`` when a rating is written, so
+    reading a top-N is a slice of an already sorted list.
+    """
+
+    def __init__(self, loader: Callable[[], Iterable]):
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._boards: Optional[Dict[_BoardKey, List[Tuple[float, int]]]] = None
+        self._entries: Dict[int, Tuple[Hashable, Dict[Optional[int], float]]] = {}
+
+    def _ensure_loaded(self):
+        """Build the boards from the database once; called with the lock held."""
+        if self._boards is not None:
+            return
+        self._boards = {}
+        self._entries = {}
+        for row in self._loader():
+            self._insert(row['id'], row['category'], row['user1_rating'], row['user2_rating'])
+
+    def _insert(self, item_id: int, category: Hashable,
+                user1_rating: Optional[int], user2_rating: Optional[int]):
+        scores = _scores(user1_rating, user2_rating)
+        if not scores:
+            return
+        self._entries[item_id] = (category, scores)
+        for kind, score in scores.items():
+            for key in _board_keys(kind, category):
+                # (-score, id): лучшие в начале, при равенстве - более старые
+                insort(self._boards.setdefault(key, []), (-score, item_id))
+
+    def _remove(self, item_id: int):
+        entry = self._entries.pop(item_id, None)
+        if entry is None:
+            return
+        category, scores = entry
+        for kind, score in scores.items():
+            for key in _board_keys(kind, category):
+                board = self._boards[key]
+                index = bisect_left(board, (-score, item_id))
+                if index < len(board) and board[index] == (-score, item_id):
+                    del board[index]
+
+    def update(self, item_id: int, category: Hashable,
+               user1_rating: Optional[int], user2_rating: Optional[int]):
+        """Set the ratings of an item (replacing previous ones)."""
+        with self._lock:
+            # Не загружено - оценки попадут в таблицы при первой загрузке
+            if self._boards is None:
+                return
+            self._remove(item_id)
+            self._insert(item_id, category, user1_rating, user2_rating)
+
+    def discard(self, item_id: int):
+        """Remove a deleted item from every board."""
+        with self._lock:
+            if self._boards is not None:
+                self._remove(item_id)
+
+    def invalidate(self):
+        """Drop the boards; the next read rebuilds them."""
+        with self._lock:
+            self._boards = None
+
+    def top(self, user_num: Optional[int] = None, category: Optional[Hashable] = None,
+            limit: int = 10) -> List[Tuple[int, float]]:
+        """Best ``limit`` items as (id, score), by average or by one user's rating."""
+        with self._lock:
+            self._ensure_loaded()
+            board = self._boards.get((user_num, category), [])
+            return [(item_id, -score) for score, item_id in board[:limit]]
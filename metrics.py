@@ -0,0 +1,269 @@
+"""Latency histograms and error counters, exported in Prometheus text format."""
+import bisect
+import functools
+import logging
+import time
+from typing import Callable, Dict, List, Tuple
+
+from aiohttp import web
+from telegram import Update
+from telegram.ext import ApplicationHandlerStop, ConversationHandler
+
+import tracing
+
+logger = logging.getLogger(__name__)
+
+# Границы корзин гистограмм, секунды
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Семейства метрик: имя -> (метка, тип, описание)
+HANDLER_DURATION = "bot_handler_duration_seconds"
+HANDLER_ERRORS = "bot_handler_errors_total"
+UPDATE_DURATION = "bot_update_duration_seconds"
+DB_DURATION = "bot_db_call_duration_seconds"
+DB_ERRORS = "bot_db_errors_total"
+KEYBOARDS_BUILT = "bot_keyboards_built_total"
+KEYBOARDS_REUSED = "bot_keyboards_reused_total"
+KEYBOARDS_CACHED = "bot_keyboards_cached"
+CATEGORY_CACHE_HITS = "bot_category_cache_hits_total"
+CATEGORY_CACHE_MISSES = "bot_category_cache_misses_total"
+
+FAMILIES = {
+    HANDLER_DURATION: ("handler", "histogram", "Time spent in a handler callback."),
+    HANDLER_ERRORS: ("handler", "counter", "Exceptions raised by a handler callback."),
+    UPDATE_DURATION: ("type", "histogram", "Time to process one update, by update type."),
+    DB_DURATION: ("function", "histogram", "Database call time, including the wait for a worker thread."),
+    DB_ERRORS: ("function", "counter", "Exceptions raised by a database call."),
+    KEYBOARDS_BUILT: ("keyboard", "counter", "Keyboard markups created."),
+    KEYBOARDS_REUSED: ("keyboard", "counter", "Keyboard requests served with an already built markup."),
+    KEYBOARDS_CACHED: ("keyboard", "gauge", "Variants of a parametrized keyboard kept in memory."),
+    CATEGORY_CACHE_HITS: ("cache", "counter", "Category lookups answered from memory."),
+    CATEGORY_CACHE_MISSES: ("cache", "counter", "Category lookups that loaded the table."),
+}
+
+# Исключения, которыми обработчики управляют потоком, а не сообщают об ошибке
+_FLOW_CONTROL = (ApplicationHandlerStop,)
+
+class Histogram:
+    """Counts of observations per bucket plus their sum."""
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation inside its bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                lower = BUCKETS[index - 1] if index else 0.0
+                if index == len(BUCKETS):
+                    return lower
+                return lower + (BUCKETS[index] - lower) * (rank - cumulative) / count
+            cumulative += count
+        return BUCKETS[-1]
+
+class Metrics:
+    """Histograms and counters of the families in FAMILIES, keyed by one label.
+
+    Used from the event loop only, so it has no lock. Counters kept by
+    other modules (keyboard registry, category caches) are not copied:
+    ``collect`` registers a function that reads them on demand.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._histograms: Dict[str, Dict[str, Histogram]] = {
+            name: {} for name, (_, kind, _) in FAMILIES.items() if kind == "histogram"
+        }
+        self._counters: Dict[str, Dict[str, int]] = {
+            name: {} for name, (_, kind, _) in FAMILIES.items() if kind != "histogram"
+        }
+        self._collectors: Dict[str, Callable[[], Dict[str, int]]] = {}
+
+    def observe(self, name: str, label: str, seconds: float):
+        family = self._histograms[name]
+        histogram = family.get(label)
+        if histogram is None:
+            histogram = family[label] = Histogram()
+        histogram.observe(seconds)
+
+    def inc(self, name: str, label: str, amount: int = 1):
+        family = self._counters[name]
+        family[label] = family.get(label, 0) + amount
+
+    def timer(self, name: str, label: str, errors: str = "") -> "_Timer":
+        """Context manager observing the block's duration (and counting its errors)."""
+        return _Timer(self, name, label, errors)
+
+    def summary(self, name: str, limit: int = 10) -> List[Tuple[str, int, float, float, float]]:
+        """(label, count, p50, p95, p99) rows, the busiest labels first."""
+        rows = [
+            (label, h.count, h.quantile(0.5), h.quantile(0.95), h.quantile(0.99))
+            for label, h in self._histograms[name].items()
+        ]
+        rows.sort(key=lambda row: -row[1])
+        return rows[:limit]
+
+    def collect(self, name: str, collector: Callable[[], Dict[str, int]]):
+        """Take the values of a counter or gauge family from ``collector`` (label -> value)."""
+        self._collectors[name] = collector
+
+    def values(self, name: str) -> Dict[str, int]:
+        """Current values of a counter or gauge family by label."""
+        collector = self._collectors.get(name)
+        if collector is not None:
+            return dict(collector())
+        return dict(self._counters[name])
+
+    def render(self) -> str:
+        """All metrics in Prometheus text exposition format."""
+        lines = [
+            "# HELP bot_uptime_seconds Seconds since the bot started.",
+            "# TYPE bot_uptime_seconds gauge",
+            f"bot_uptime_seconds {time.time() - self.started_at:.3f}",
+        ]
+        for name, (label_name, kind, help_text) in FAMILIES.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind != "histogram":
+                for label, value in sorted(self.values(name).items()):
+                    lines.append(f'{name}{{{label_name}="{_escape(label)}"}} {value}')
+                continue
+            for label, histogram in sorted(self._histograms[name].items()):
+                label_text = f'{label_name}="{_escape(label)}"'
+                cumulative = 0
+                for bound, count in zip(BUCKETS, histogram.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{{label_text},le="+Inf"}} {histogram.count}')
+                lines.append(f"{name}_sum{{{label_text}}} {histogram.sum:.6f}")
+                lines.append(f"{name}_count{{{label_text}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+class _Timer:
+    __slots__ = ("metrics", "name", "label", "errors", "started")
+
+    def __init__(self, metrics: Metrics, name: str, label: str, errors: str):
+        self.metrics = metrics
+        self.name = name
+        self.label = label
+        self.errors = errors
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.observe(self.name, self.label, time.perf_counter() - self.started)
+        if exc_type is not None and self.errors and not issubclass(exc_type, _FLOW_CONTROL):
+            self.metrics.inc(self.errors, self.label)
+        return False
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+metrics = Metrics()
+
+def update_type(update: object) -> str:
+    """Label for an update: the kind of its payload."""
+    if isinstance(update, Update):
+        for kind in ("callback_query", "message", "inline_query", "edited_message"):
+            if getattr(update, kind) is not None:
+                return kind
+    return "other"
+
+def callback_label(callback: Callable) -> str:
+    """Handler label: function name, prefixed by ``metrics_prefix`` of its object if any."""
+    prefix = getattr(getattr(callback, "__self__", None), "metrics_prefix", None)
+    name = getattr(callback, "__name__", type(callback).__name__)
+    return f"{prefix}.{name}" if prefix else name
+
+def timed_handler(callback: Callable) -> Callable:
+    """Wrap a handler callback to record its latency and errors (and a trace span)."""
+    if getattr(callback, "_metrics_wrapped", False):
+        return callback
+    label = callback_label(callback)
+
+    @functools.wraps(callback)
+    async def wrapper(update, context):
+        with metrics.timer(HANDLER_DURATION, label, errors=HANDLER_ERRORS), tracing.span(f"handler {label}"):
+            return await callback(update, context)
+
+    wrapper._metrics_wrapped = True
+    return wrapper
+
+def _instrument_handler(handler):
+    if isinstance(handler, ConversationHandler):
+        nested = list(handler.entry_points) + list(handler.fallbacks)
+        for state_handlers in handler.states.values():
+            nested.extend(state_handlers)
+        for child in nested:
+            _instrument_handler(child)
+    elif hasattr(handler, "wrap_callbacks"):
+        # CallbackRouter: колбэки лежат в маршрутах
+        handler.wrap_callbacks(timed_handler)
+    else:
+        handler.callback = timed_handler(handler.callback)
+
+def instrument_application(application):
+    """Wrap the callbacks of every registered handler (call after registration)."""
+    for group_handlers in application.handlers.values():
+        for handler in group_handlers:
+            _instrument_handler(handler)
+
+def format_summary(limit: int = 10) -> str:
+    """Plain-text p50/p95/p99 table for the /metrics command."""
+    uptime = time.time() - metrics.started_at
+    lines = [f"📊 Метрики за {uptime / 3600:.1f} ч"]
+    sections = (
+        ("Обновления", UPDATE_DURATION, None),
+        ("Обработчики", HANDLER_DURATION, HANDLER_ERRORS),
+        ("База данных", DB_DURATION, DB_ERRORS),
+    )
+    for title, name, errors_name in sections:
+        rows = metrics.summary(name, limit)
+        if not rows:
+            continue
+        errors = metrics.errors(errors_name) if errors_name else {}
+        lines.append(f"\n{title} (n, p50/p95/p99 мс):")
+        for label, count, p50, p95, p99 in rows:
+            line = f"{label}: {count}, {p50 * 1000:.1f}/{p95 * 1000:.1f}/{p99 * 1000:.1f}"
+            if errors.get(label):
+                line += f", ошибок {errors[label]}"
+            lines.append(line)
+    keyboards = metrics.values(KEYBOARDS_BUILT)
+    if keyboards:
+        reused = metrics.values(KEYBOARDS_REUSED)
+        lines.append(f"\nКлавиатуры: создано {sum(keyboards.values())}, из памяти {sum(reused.values())}")
+        for name in sorted(keyboards, key=lambda name: -keyboards[name])[:limit]:
+            lines.append(f"{name}: {keyboards[name]}/{reused.get(name, 0)}")
+    hits, misses = metrics.values(CATEGORY_CACHE_HITS), metrics.values(CATEGORY_CACHE_MISSES)
+    if hits or misses:
+        lines.append("\nКэш категорий (попадания/промахи):")
+        for name in sorted(set(hits) | set(misses)):
+            lines.append(f"{name}: {hits.get(name, 0)}/{misses.get(name, 0)}")
+    return "\n".join(lines)
+
+async def start_metrics_server(listen: str, port: int) -> web.AppRunner:
+    """Serve GET /metrics on ``listen:port``; returns the runner to clean up on shutdown."""
+    async def handle(request: web.Request) -> web.Response:
+        return web.Response(text=metrics.render(), content_type="text/plain", charset="utf-8")
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, listen, port).start()
+    logger.info(f"Metrics available at http://{listen}:{port}/metrics")
+    return runner
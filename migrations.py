@@ -0,0 +1,294 @@
+"""Versioned schema migrations.
+
+Each migration has a number, a description and either a list of SQL
+statements or a function taking a cursor. Applied versions are recorded
+in the ``schema_version`` table; ``apply_migrations`` runs only the ones
+that are missing, in order, each in its own transaction together with
+its ``schema_version`` row, so a failed migration leaves no partial schema.
+"""
+import sqlite3
+import logging
+from typing import Callable, List, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+def _base_schema(cursor: sqlite3.Cursor):
+    """Tables as they existed before versioned migrations."""
+    # Movies
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS movie_categories (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS movies (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            note TEXT,
+            category_id INTEGER NOT NULL,
+            user1_rating INTEGER,
+            user2_rating INTEGER,
+            watched INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (category_id) REFERENCES movie_categories(id)
+        )
+    """)
+
+    # Activities
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS activities (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            note TEXT,
+            status TEXT DEFAULT 'planned',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Trips
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS trip_categories (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS trips (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            note TEXT,
+            category_id INTEGER NOT NULL,
+            visited INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (category_id) REFERENCES trip_categories(id)
+        )
+    """)
+
+    # Добавить колонку visited если её нет (для баз, созданных до её появления)
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(trips)")}
+    if 'visited' not in columns:
+        cursor.execute("ALTER TABLE trips ADD COLUMN visited INTEGER DEFAULT 0")
+
+    # TikTok Trends
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS tiktok_trends (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            video_file_id TEXT,
+            status TEXT DEFAULT 'todo',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Photo Categories
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS photo_categories (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT UNIQUE NOT NULL,
+            link TEXT,
+            description TEXT
+        )
+    """)
+
+    # Games
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS games (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            note TEXT,
+            genre TEXT,
+            status TEXT DEFAULT 'pending',
+            user1_rating INTEGER,
+            user2_rating INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Sexual (без категорий, простой список)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS sexual (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            link TEXT,
+            description TEXT
+        )
+    """)
+
+def _default_rows(cursor: sqlite3.Cursor):
+    """Default categories, inserted once instead of on every startup."""
+    for cat in ['Фильм', 'Сериал', 'Мультик']:
+        cursor.execute("INSERT OR IGNORE INTO movie_categories (name) VALUES (?)", (cat,))
+    for cat in ['Пешком', 'Поездки', 'Места в Херцег-Нови']:
+        cursor.execute("INSERT OR IGNORE INTO trip_categories (name) VALUES (?)", (cat,))
+    # Пользовательские категории фотографий больше не удаляются
+    for title in ['for all', 'not for all']:
+        cursor.execute("INSERT OR IGNORE INTO photo_categories (title) VALUES (?)", (title,))
+
+# Разделы полнотекстового поиска: таблица -> (код в rowid, колонка заголовка, колонки текста)
+# rowid записи в search_index = id * SEARCH_ROWID_FACTOR + код раздела
+SEARCH_ROWID_FACTOR = 8
+SEARCH_SOURCES = {
+    'movies': (1, 'title', ['note']),
+    'activities': (2, 'title', ['note']),
+    'trips': (3, 'title', ['note']),
+    'tiktok_trends': (4, 'title', []),
+    'photo_categories': (5, 'title', ['description']),
+    'games': (6, 'title', ['note', 'genre']),
+    'sexual': (7, 'title', ['description']),
+}
+
+def _fold_yo(expression: str) -> str:
+    """SQL expression replacing ё with е (unicode61 treats them as different letters)."""
+    return f"replace(replace({expression}, 'ё', 'е'), 'Ё', 'Е')"
+
+def _search_index(cursor: sqlite3.Cursor):
+    """FTS5 index over every section, kept in sync by triggers."""
+    cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+            label UNINDEXED, title, body,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+    """)
+    for table, (code, title_column, body_columns) in SEARCH_SOURCES.items():
+        def values(prefix: str) -> str:
+            body = " || ' ' || ".join(f"COALESCE({prefix}.{c}, '')" for c in body_columns) or "''"
+            # label - заголовок для вывода; title/body - текст для поиска с ё -> е
+            return (f"{prefix}.id * {SEARCH_ROWID_FACTOR} + {code}, {prefix}.{title_column}, "
+                    f"{_fold_yo(prefix + '.' + title_column)}, {_fold_yo(body)}")
+
+        watched = ", ".join([title_column] + body_columns)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_search_insert AFTER INSERT ON {table} BEGIN
+                INSERT INTO search_index (rowid, label, title, body) VALUES ({values('new')});
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_search_update AFTER UPDATE OF {watched} ON {table} BEGIN
+                DELETE FROM search_index WHERE rowid = old.id * {SEARCH_ROWID_FACTOR} + {code};
+                INSERT INTO search_index (rowid, label, title, body) VALUES ({values('new')});
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_search_delete AFTER DELETE ON {table} BEGIN
+                DELETE FROM search_index WHERE rowid = old.id * {SEARCH_ROWID_FACTOR} + {code};
+            END
+        """)
+        # Проиндексировать уже существующие записи
+        cursor.execute(f"DELETE FROM search_index WHERE rowid % {SEARCH_ROWID_FACTOR} = {code}")
+        cursor.execute(f"INSERT INTO search_index (rowid, label, title, body) SELECT {values(table)} FROM {table}")
+
+Migration = Tuple[int, str, Union[List[str], Callable[[sqlite3.Cursor], None]]]
+
+MIGRATIONS: List[Migration] = [
+    (1, "Base schema", _base_schema),
+    (2, "Indexes for list queries", [
+        # get_section_items("movies"): фильтр по watched (+ category_id), сортировка по created_at
+        "CREATE INDEX IF NOT EXISTS idx_movies_watched_category_created ON movies (watched, category_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_movies_watched_created ON movies (watched, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_games_status_created ON games (status, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_activities_status_created ON activities (status, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_tiktok_trends_status_created ON tiktok_trends (status, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_trips_category_created ON trips (category_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_trips_created ON trips (created_at)",
+    ]),
+    (3, "Default categories", _default_rows),
+    (4, "Index for game genres", [
+        "CREATE INDEX IF NOT EXISTS idx_games_status_genre ON games (status, genre, created_at)",
+    ]),
+    (5, "Full-text search index", _search_index),
+    (6, "Bot state persistence", [
+        # user_data в JSON, по строке на пользователя
+        """CREATE TABLE IF NOT EXISTS bot_user_data (
+               user_id INTEGER PRIMARY KEY,
+               data TEXT NOT NULL
+           )""",
+        # Состояния ConversationHandler: key - JSON-список (chat_id, user_id)
+        """CREATE TABLE IF NOT EXISTS bot_conversations (
+               name TEXT NOT NULL,
+               key TEXT NOT NULL,
+               state TEXT NOT NULL,
+               PRIMARY KEY (name, key)
+           )""",
+    ]),
+    (7, "TikTok media cache", [
+        # Метаданные видео трендов; status: ok | broken (file_id больше не работает)
+        """CREATE TABLE IF NOT EXISTS tiktok_media (
+               trend_id INTEGER PRIMARY KEY,
+               file_id TEXT NOT NULL,
+               file_unique_id TEXT,
+               duration INTEGER,
+               file_size INTEGER,
+               thumbnail_file_id TEXT,
+               status TEXT NOT NULL DEFAULT 'ok',
+               checked_at TIMESTAMP,
+               updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+               FOREIGN KEY (trend_id) REFERENCES tiktok_trends(id)
+           )""",
+        "CREATE INDEX IF NOT EXISTS idx_tiktok_media_checked ON tiktok_media (checked_at)",
+        # Уже сохранённые видео - без метаданных, они заполнятся при следующей отправке
+        """INSERT OR IGNORE INTO tiktok_media (trend_id, file_id)
+           SELECT id, video_file_id FROM tiktok_trends WHERE video_file_id IS NOT NULL""",
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+def read_schema_version(cursor: sqlite3.Cursor) -> int:
+    """Read the applied version without creating anything (0 if unknown)."""
+    try:
+        row = cursor.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return row[0] or 0
+
+def get_schema_version(cursor: sqlite3.Cursor) -> int:
+    """Return the highest applied migration number (0 for a fresh database)."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    row = cursor.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+def apply_migrations(cursor: sqlite3.Cursor) -> int:
+    """Apply pending migrations in order; returns how many were applied."""
+    conn = cursor.connection
+    current = get_schema_version(cursor)
+    applied = 0
+    # Модуль sqlite3 сам открывает транзакцию только перед INSERT/UPDATE/DELETE,
+    # а DDL выполняет в autocommit - поэтому BEGIN/COMMIT явно
+    isolation_level = conn.isolation_level
+    if conn.in_transaction:
+        conn.commit()
+    conn.isolation_level = None
+    try:
+        for version, description, step in MIGRATIONS:
+            if version <= current:
+                continue
+            logger.info(f"Applying migration {version}: {description}")
+            cursor.execute("BEGIN")
+            try:
+                if callable(step):
+                    step(cursor)
+                else:
+                    for statement in step:
+                        cursor.execute(statement)
+                cursor.execute(
+                    "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                    (version, description)
+                )
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+            cursor.execute("COMMIT")
+            applied += 1
+    finally:
+        conn.isolation_level = isolation_level
+    return applied
@@ -1,6 +1,6 @@
 """Database models and schema definitions."""
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Optional, Tuple
 from datetime import datetime
 
 @dataclass
@@ -79,3 +79,124 @@ class SexualCategory:
     id: int
     name: str
 
+
+@dataclass
+class Page:
+    """One page of a list query plus the total row count."""
+    items: list
+    total: int
+    page: int
+    per_page: int
+
+@dataclass
+class SearchResult:
+    """One full-text search hit: section table, row id and title."""
+    section: str
+    item_id: int
+    title: str
+
+@dataclass(frozen=True)
+class SectionField:
+    """A column filled in by the add/edit dialogs of a section."""
+    name: str
+    prompt: str
+    edit_prompt: str = ""
+    emoji: str = ""          # префикс строки в карточке; у заголовка не нужен
+    required: bool = False
+    video: bool = False      # ждёт видео (file_id), а не текст; не редактируется
+
+@dataclass(frozen=True)
+class SectionStatus:
+    """A value of the status column with its own list in the section menu.
+
+    ``key`` is its callback segment (``value`` if empty). A status with
+    ``by_category`` opens a submenu: the whole list plus one per category.
+    """
+    value: Any
+    button: str
+    key: str = ""
+    title: str = ""          # заголовок подменю
+    by_category: bool = False
+
+    @property
+    def callback(self) -> str:
+        return self.key or str(self.value)
+
+@dataclass(frozen=True)
+class SectionFilter:
+    """A fixed category list: callback segment, category name and button."""
+    key: str
+    category: str
+    button: str
+
+@dataclass(frozen=True)
+class SectionCategory:
+    """Category of the records of a section.
+
+    With ``table`` the column holds an id from that table and the add
+    dialog ends with a category keyboard (plus "new category"); without
+    it the column is a plain text field (a genre) and its distinct values
+    are the categories. ``filters`` are fixed lists shown instead of one
+    button per category.
+    """
+    column: str
+    table: str = ""
+    prompt: str = "Выберите категорию:"
+    new_prompt: str = "Введите название новой категории:"
+    filters: Tuple[SectionFilter, ...] = ()
+
+@dataclass(frozen=True)
+class SectionMedia:
+    """Cache of the video of a record: table and its column with the record id."""
+    table: str
+    item_column: str
+
+@dataclass(frozen=True)
+class SectionSpec:
+    """Declarative description of a list section (see sections.py).
+
+    ``key`` is used in menu callbacks (``<key>:menu``), ``prefix`` in item
+    callbacks (``<prefix>:<id>``) and ``name`` in conversation names and
+    user_data keys. The first field is the title. A section with
+    ``statuses`` gets a menu with one list per status; a section without
+    them shows its fixed category lists or its only list in the menu.
+    ``done_status`` adds the ``<prefix>:<id>:<done_action>`` button; with
+    ``rated`` it asks both users for a 1-10 rating first and the done
+    list gets a top-10. ``random_button`` adds a random pick among
+    records with the first status, ``random_exclude`` lists categories
+    never picked; ``random_weighted`` makes records that have been
+    waiting longer come up more often.
+    """
+    key: str
+    name: str
+    prefix: str
+    table: str
+    emoji: str
+    title: str
+    menu_button: str
+    fields: Tuple[SectionField, ...]
+    order_by: str = "id DESC"
+    status_column: str = "status"
+    statuses: Tuple[SectionStatus, ...] = ()
+    done_status: Any = None
+    done_action: str = "done"
+    done_button: str = "✅ Выполнено"
+    category: Optional[SectionCategory] = None
+    media: Optional[SectionMedia] = None
+    rated: bool = False
+    top_title: str = "🏆 Топ-10"
+    random_button: str = ""
+    random_title: str = "🎲 Случайная запись:"
+    random_empty_text: str = "Нет доступных записей"
+    random_exclude: Tuple[str, ...] = ()
+    random_weighted: bool = False
+    add_button: str = "➕ Добавить"
+    choose_text: str = "Выберите запись:"
+    empty_text: str = "Список пуст"
+    not_found_text: str = "Запись не найдена"
+    added_text: str = "✅ Запись добавлена!"
+    updated_text: str = "✅ Запись обновлена!"
+    deleted_text: str = "✅ Запись удалена!"
+    done_text: str = "✅ Выполнено!"
+    editable: bool = False
+    deletable: bool = False
@@ -0,0 +1,141 @@
+"""SQLite-backed PTB persistence for user_data and conversation states."""
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from telegram.ext import BasePersistence, PersistenceInput
+
+import async_database
+
+logger = logging.getLogger(__name__)
+
+# Как часто PTB передаёт изменения (сек) и задержка перед записью накопленной пачки
+UPDATE_INTERVAL = 30
+FLUSH_DELAY = 1.0
+
+class SQLitePersistence(BasePersistence):
+    """Stores ``user_data`` and ConversationHandler states in multilists.db.
+
+    PTB hands over changes every ``update_interval`` seconds. They are
+    collected in memory and written together in one transaction
+    ``flush_delay`` seconds later. user_data that serializes to the
+    same JSON as the stored copy is not written again. On shutdown
+    ``flush`` writes whatever is still pending.
+    """
+
+    def __init__(self, update_interval: float = UPDATE_INTERVAL, flush_delay: float = FLUSH_DELAY):
+        super().__init__(
+            store_data=PersistenceInput(bot_data=False, chat_data=False, user_data=True, callback_data=False),
+            update_interval=update_interval
+        )
+        self.flush_delay = flush_delay
+        self._saved_user_data: Dict[int, str] = {}
+        self._pending_user_data: Dict[int, Optional[str]] = {}
+        self._pending_conversations: Dict[Tuple[str, tuple], Any] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_sleeping = False
+
+    def _schedule_flush(self):
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._delayed_flush())
+
+    async def _delayed_flush(self):
+        self._flush_sleeping = True
+        try:
+            await asyncio.sleep(self.flush_delay)
+        finally:
+            self._flush_sleeping = False
+        await self._write_pending()
+
+    async def _write_pending(self):
+        """Write everything collected so far in one transaction."""
+        if not self._pending_user_data and not self._pending_conversations:
+            return
+        user_data, self._pending_user_data = self._pending_user_data, {}
+        conversations, self._pending_conversations = self._pending_conversations, {}
+        try:
+            await async_database.save_persisted_state(user_data, conversations)
+        except Exception:
+            # Вернуть несохранённое, чтобы записать со следующей пачкой
+            for user_id, data in user_data.items():
+                self._pending_user_data.setdefault(user_id, data)
+            for key, state in conversations.items():
+                self._pending_conversations.setdefault(key, state)
+            logger.exception("Failed to save bot state")
+            return
+        for user_id, data in user_data.items():
+            if data is None:
+                self._saved_user_data.pop(user_id, None)
+            else:
+                self._saved_user_data[user_id] = data
+        logger.debug(f"Saved state: {len(user_data)} user(s), {len(conversations)} conversation(s)")
+
+    async def get_user_data(self) -> Dict[int, dict]:
+        user_data = await async_database.get_persisted_user_data()
+        self._saved_user_data = {
+            user_id: json.dumps(data, ensure_ascii=False, sort_keys=True)
+            for user_id, data in user_data.items()
+        }
+        return user_data
+
+    async def get_chat_data(self) -> Dict[int, dict]:
+        return {}
+
+    async def get_bot_data(self) -> dict:
+        return {}
+
+    async def get_callback_data(self) -> None:
+        return None
+
+    async def get_conversations(self, name: str) -> Dict[tuple, object]:
+        return await async_database.get_persisted_conversations(name)
+
+    async def update_conversation(self, name: str, key: tuple, new_state: Optional[object]) -> None:
+        self._pending_conversations[(name, key)] = new_state
+        self._schedule_flush()
+
+    async def update_user_data(self, user_id: int, data: dict) -> None:
+        serialized = json.dumps(data, ensure_ascii=False, sort_keys=True)
+        if self._pending_user_data.get(user_id, self._saved_user_data.get(user_id)) == serialized:
+            return
+        self._pending_user_data[user_id] = serialized
+        self._schedule_flush()
+
+    async def drop_user_data(self, user_id: int) -> None:
+        self._pending_user_data[user_id] = None
+        self._schedule_flush()
+
+    async def update_chat_data(self, chat_id: int, data: dict) -> None:
+        """chat_data is not stored."""
+
+    async def drop_chat_data(self, chat_id: int) -> None:
+        """chat_data is not stored."""
+
+    async def update_bot_data(self, data: dict) -> None:
+        """bot_data is not stored."""
+
+    async def update_callback_data(self, data) -> None:
+        """Callback data is not stored."""
+
+    async def refresh_user_data(self, user_id: int, user_data: dict) -> None:
+        """Data lives in memory between flushes, nothing to refresh."""
+
+    async def refresh_chat_data(self, chat_id: int, chat_data: dict) -> None:
+        """chat_data is not stored."""
+
+    async def refresh_bot_data(self, bot_data: dict) -> None:
+        """bot_data is not stored."""
+
+    async def flush(self) -> None:
+        """Write pending changes right away (called on shutdown).
+
+        A scheduled flush that is still waiting is cancelled. One that is
+        already writing is awaited: its batch has left the pending dicts.
+        """
+        task = self._flush_task
+        if task and not task.done():
+            if self._flush_sleeping:
+                task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        await self._write_pending()
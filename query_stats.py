@@ -0,0 +1,197 @@
+"""Per-statement SQL statistics and a slow-query log with query plans."""
+import functools
+import logging
+import re
+import sqlite3
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+from config import SLOW_QUERY_MS
+
+logger = logging.getLogger(__name__)
+
+# Сколько обращений к стеку просматривать в поисках вызывающей функции
+CALLER_DEPTH = 8
+# Признаки плана, которые стоит показать в /queries
+_PLAN_WARNINGS = ("SCAN", "USE TEMP B-TREE")
+# Предел длины одного сообщения Telegram
+MESSAGE_LIMIT = 4096
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)+\s*\)", re.IGNORECASE)
+_SPACES = re.compile(r"\s+")
+
+@functools.lru_cache(maxsize=1024)
+def normalize(sql: str) -> str:
+    """SQL text with literals replaced by ``?`` and whitespace collapsed.
+
+    ``IN (?, ?, ?)`` lists of any length become ``IN (?...)``, so
+    statements differing only in values or list sizes share one entry.
+    """
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("IN (?...)", sql)
+    return _SPACES.sub(" ", sql).strip()
+
+def explain(conn: sqlite3.Connection, sql: str, params: tuple) -> str:
+    """EXPLAIN QUERY PLAN of a statement as an indented tree."""
+    rows = conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+    depth = {0: -1}
+    lines = []
+    for node_id, parent, _, detail in rows:
+        depth[node_id] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node_id] + detail)
+    return "\n".join(lines)
+
+class _Statement:
+    __slots__ = ("sql", "calls", "total", "max", "rows", "slow", "callers", "plan")
+
+    def __init__(self, sql: str):
+        self.sql = sql
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.slow = 0
+        self.callers: Dict[str, int] = {}
+        self.plan: Optional[str] = None
+
+class QueryStats:
+    """Time, rows and callers of every executed statement, by normalized SQL.
+
+    Statements run in the database worker threads, so updates take a lock.
+    The plan of each statement is taken once, on its first execution;
+    a statement slower than ``slow_ms`` is logged with a fresh plan.
+    """
+
+    def __init__(self, slow_ms: float = SLOW_QUERY_MS):
+        self.slow_ms = slow_ms
+        self.since = time.time()
+        self._statements: Dict[str, _Statement] = {}
+        self._lock = threading.Lock()
+
+    def measure(self, conn: sqlite3.Connection, sql: str, params: tuple = ()) -> "_Measure":
+        """Context manager timing one statement; set ``rows`` on it before exit."""
+        return _Measure(self, conn, sql, params)
+
+    def record(self, conn: sqlite3.Connection, sql: str, params: tuple,
+               seconds: float, rows: int, caller: str):
+        key = normalize(sql)
+        with self._lock:
+            statement = self._statements.get(key)
+            new = statement is None
+            if new:
+                statement = self._statements[key] = _Statement(key)
+            statement.calls += 1
+            statement.total += seconds
+            statement.max = max(statement.max, seconds)
+            statement.rows += rows
+            statement.callers[caller] = statement.callers.get(caller, 0) + 1
+            slow = seconds * 1000 >= self.slow_ms
+            if slow:
+                statement.slow += 1
+        if not (new or slow):
+            return
+        try:
+            plan = explain(conn, sql, params)
+        except sqlite3.Error as e:
+            plan = f"(no plan: {e})"
+        statement.plan = plan
+        if slow:
+            logger.warning(f"Slow query {seconds * 1000:.1f}ms in {caller}, {rows} row(s): {key}\n{plan}")
+
+    def top(self, limit: int = 10) -> List[_Statement]:
+        """Statements with the largest total time first."""
+        with self._lock:
+            statements = list(self._statements.values())
+        statements.sort(key=lambda statement: -statement.total)
+        return statements[:limit]
+
+    def reset(self):
+        """Start collecting from scratch."""
+        with self._lock:
+            self._statements.clear()
+            self.since = time.time()
+
+def _caller(frame) -> str:
+    """First public function up the stack in the module that ran the statement.
+
+    Private helpers and lambdas (loaders passed to caches) are skipped.
+    """
+    module = frame.f_globals.get("__name__")
+    first = frame.f_code.co_name
+    for _ in range(CALLER_DEPTH):
+        if frame is None:
+            break
+        name = frame.f_code.co_name
+        if frame.f_globals.get("__name__") == module and not name.startswith(("_", "<")):
+            return name
+        frame = frame.f_back
+    return first
+
+class _Measure:
+    __slots__ = ("stats", "conn", "sql", "params", "rows", "started")
+
+    def __init__(self, stats: QueryStats, conn: sqlite3.Connection, sql: str, params: tuple):
+        self.stats = stats
+        self.conn = conn
+        self.sql = sql
+        self.params = params
+        self.rows = 0
+
+    def __enter__(self) -> "_Measure":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            seconds = time.perf_counter() - self.started
+            self.stats.record(self.conn, self.sql, self.params, seconds, self.rows, _caller(sys._getframe(1)))
+        return False
+
+query_stats = QueryStats()
+
+def _pack(blocks: List[str], limit: int = MESSAGE_LIMIT) -> List[str]:
+    """Join text blocks into messages of at most ``limit`` characters, never splitting a block."""
+    messages: List[str] = []
+    current = ""
+    for block in blocks:
+        block = block[:limit]
+        if current and len(current) + 1 + len(block) > limit:
+            messages.append(current)
+            current = block.lstrip("\n")
+        else:
+            current = f"{current}\n{block}" if current else block
+    messages.append(current)
+    return messages
+
+def format_top(limit: int = 10) -> List[str]:
+    """Plain-text top of statements by total time for the /queries command.
+
+    Returned as a list of messages: ten long statements with plans do not
+    fit into one Telegram message.
+    """
+    statements = query_stats.top(limit)
+    hours = (time.time() - query_stats.since) / 3600
+    if not statements:
+        return [f"🐢 Запросов к базе за {hours:.1f} ч не было"]
+    blocks = [f"🐢 Самые затратные запросы за {hours:.1f} ч (порог медленных {query_stats.slow_ms:g} мс)"]
+    for index, statement in enumerate(statements, 1):
+        callers = ", ".join(sorted(statement.callers, key=lambda name: -statement.callers[name]))
+        lines = [
+            f"\n{index}. {statement.sql[:200]}\n"
+            f"   {callers}: {statement.calls} раз, всего {statement.total * 1000:.1f} мс, "
+            f"среднее {statement.total / statement.calls * 1000:.2f} мс, макс {statement.max * 1000:.1f} мс, "
+            f"строк {statement.rows / statement.calls:.1f}"
+        ]
+        if statement.slow:
+            lines.append(f"   медленных: {statement.slow}")
+        if statement.plan:
+            warnings = [line.strip() for line in statement.plan.splitlines() if line.strip().startswith(_PLAN_WARNINGS)]
+            if warnings:
+                lines.append("   план: " + "; ".join(warnings))
+        blocks.append("\n".join(lines))
+    return _pack(blocks)
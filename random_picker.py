@@ -0,0 +1,117 @@
+"""Constant-time random selection over id sets kept in memory."""
+import random
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Сколько раз пытаться выбрать id, прежде чем перебрать кандидатов целиком
+MAX_ATTEMPTS = 64
+DAY = 86400
+
+class RandomPicker:
+    """Random id selection for one (table, filter) pair.
+
+    ``loader`` returns ``(id, created)`` pairs matching the filter, where
+    ``created`` is the creation time as a Unix timestamp. The ids are
+    loaded on first use and then kept in sync by the functions that write
+    to the table (``add``/``discard``), so a pick never touches SQLite.
+
+    A weighted pick favours records that have been waiting longer: the
+    weight is the age in days plus one, computed at pick time.
+
+    ``history`` is the number of recent picks that are not suggested again
+    while other candidates remain.
+    """
+
+    def __init__(self, loader: Callable[[], Iterable[Tuple[int, float]]], history: int = 0):
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._ids: Optional[List[int]] = None
+        self._pos: Dict[int, int] = {}
+        self._created: Dict[int, float] = {}
+        self._oldest = float("inf")
+        self._recent: deque = deque(maxlen=history)
+
+    def _ensure_loaded(self):
+        """Load ids from the database once; called with the lock held."""
+        if self._ids is not None:
+            return
+        self._ids = []
+        self._pos = {}
+        self._created = {}
+        self._oldest = float("inf")
+        for item_id, created in self._loader():
+            self._insert(item_id, created)
+
+    def _insert(self, item_id: int, created: float):
+        if item_id not in self._pos:
+            self._pos[item_id] = len(self._ids)
+            self._ids.append(item_id)
+        self._created[item_id] = created
+        self._oldest = min(self._oldest, created)
+
+    def add(self, item_id: int, created: Optional[float] = None):
+        """Add an id after it starts matching the filter; ``created`` defaults to now."""
+        with self._lock:
+            # Ещё не загружен - новый id попадёт в выборку при первой загрузке
+            if self._ids is not None:
+                self._insert(item_id, time.time() if created is None else created)
+
+    def discard(self, item_id: int):
+        """Remove an id after it stops matching the filter or is deleted."""
+        with self._lock:
+            if self._ids is None or item_id not in self._pos:
+                return
+            # Перенести последний элемент на место удаляемого - O(1)
+            index = self._pos.pop(item_id)
+            last = self._ids.pop()
+            if last != item_id:
+                self._ids[index] = last
+                self._pos[last] = index
+            del self._created[item_id]
+            # _oldest остаётся нижней границей, точность восстановится при перезагрузке
+
+    def invalidate(self):
+        """Drop the loaded ids; the next pick reloads them."""
+        with self._lock:
+            self._ids = None
+
+    def pick(self, weighted: bool = False) -> Optional[int]:
+        """Pick a random id, skipping recent picks while possible.
+
+        With ``weighted`` the probability of an id is proportional to its
+        age in days plus one (rejection sampling, so the cost does not
+        depend on the number of ids).
+        """
+        with self._lock:
+            self._ensure_loaded()
+            if not self._ids:
+                return None
+            now = time.time()
+            max_weight = (now - self._oldest) / DAY + 1
+            recent = {item_id for item_id in self._recent if item_id in self._pos}
+            if len(recent) >= len(self._ids):
+                recent = set()
+            for _ in range(MAX_ATTEMPTS):
+                item_id = self._ids[random.randrange(len(self._ids))]
+                if item_id in recent:
+                    continue
+                if weighted and random.random() * max_weight > (now - self._created[item_id]) / DAY + 1:
+                    continue
+                break
+            else:
+                # Маловероятно: почти все кандидаты исключены, выбрать из оставшихся явно
+                candidates = [i for i in self._ids if i not in recent]
+                if weighted:
+                    weights = [(now - self._created[i]) / DAY + 1 for i in candidates]
+                    item_id = random.choices(candidates, weights)[0]
+                else:
+                    item_id = random.choice(candidates)
+            self._recent.append(item_id)
+            return item_id
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._ids)
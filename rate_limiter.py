@@ -0,0 +1,208 @@
+"""Outbound Bot API rate limiting with edit coalescing and flood-control backoff."""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Union
+
+from telegram.error import BadRequest, NetworkError, RetryAfter
+from telegram.ext import BaseRateLimiter
+
+import tracing
+
+logger = logging.getLogger(__name__)
+
+# Лимиты Telegram: ~30 сообщений в секунду всего и ~1 в секунду в один чат (с небольшим запасом на всплеск)
+GLOBAL_RATE = 30
+GLOBAL_BURST = 30
+CHAT_RATE = 1
+CHAT_BURST = 3
+
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5  # сек, удваивается с каждой попыткой
+
+# Сколько последних отредактированных/отправленных сообщений помнить для пропуска одинаковых правок
+CONTENT_CACHE_SIZE = 1024
+
+# Лимит на чат относится к новым сообщениям; правки и удаления ждут только паузу flood control
+_SEND_PREFIXES = ("send", "copy", "forward")
+_EDIT_ENDPOINTS = {"editMessageText", "editMessageCaption", "editMessageReplyMarkup", "editMessageMedia"}
+# Повтор после сетевой ошибки безопасен только там, где повторный вызов ничего не продублирует
+_IDEMPOTENT_PREFIXES = ("edit", "delete", "answer", "get", "set")
+# Поля запроса, которые определяют видимое содержимое сообщения
+# (editMessageMedia не сравнивается: InputMedia не умеет сравнивать себя по содержимому)
+_CONTENT_FIELDS = ("text", "caption", "reply_markup", "parse_mode", "entities",
+                   "caption_entities", "disable_web_page_preview")
+
+class TokenBucket:
+    """Allows ``rate`` acquisitions per second with bursts of up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def wait_pause(self):
+        """Wait while the bucket is paused by flood control."""
+        while (delay := self._paused_until - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+
+    async def acquire(self):
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            await self.wait_pause()
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+    def pause(self, seconds: float):
+        """Hand out no tokens for ``seconds`` (flood control)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._refill()
+        self._tokens = min(self._tokens, 0)
+
+class OutboundRateLimiter(BaseRateLimiter[None]):
+    """Central limiter for every Bot API call made by the application.
+
+    * a global bucket for all calls and a bucket per chat for new messages
+      keep the bot under Telegram limits;
+    * an edit that is overtaken by a newer edit of the same message while
+      waiting for its turn is dropped (only the latest content is sent);
+    * an edit repeating the message's current content is not sent at all,
+      and "message is not modified" errors are swallowed;
+    * RetryAfter pauses the chat (all calls to it, edits included) for the
+      requested time and retries; network
+      errors of idempotent calls are retried with exponential backoff.
+    """
+
+    def __init__(self, global_rate: float = GLOBAL_RATE, chat_rate: float = CHAT_RATE,
+                 chat_burst: float = CHAT_BURST, max_retries: int = MAX_RETRIES):
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.max_retries = max_retries
+        self._global = TokenBucket(global_rate, max(GLOBAL_BURST, global_rate))
+        self._chats: Dict[Union[int, str], TokenBucket] = {}
+        self._edit_generation: Dict[tuple, int] = {}
+        self._content: OrderedDict = OrderedDict()
+        self.skipped_edits = 0
+        self.coalesced_edits = 0
+        self.retries = 0
+
+    async def initialize(self) -> None:
+        """Nothing to set up."""
+
+    async def shutdown(self) -> None:
+        """Nothing to release."""
+
+    def _chat_bucket(self, chat_id: Union[int, str]) -> TokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            bucket = self._chats[chat_id] = TokenBucket(self.chat_rate, self.chat_burst)
+        return bucket
+
+    @staticmethod
+    def _message_key(data: Dict[str, Any]) -> Optional[tuple]:
+        if data.get("inline_message_id"):
+            return ("inline", data["inline_message_id"])
+        if data.get("chat_id") is not None and data.get("message_id") is not None:
+            return (data["chat_id"], data["message_id"])
+        return None
+
+    def _remember_content(self, key: tuple, content: tuple):
+        self._content[key] = content
+        self._content.move_to_end(key)
+        while len(self._content) > CONTENT_CACHE_SIZE:
+            self._content.popitem(last=False)
+
+    async def process_request(
+        self,
+        callback: Callable[..., Coroutine[Any, Any, Union[bool, Dict[str, Any], List[Dict[str, Any]]]]],
+        args: Any,
+        kwargs: Dict[str, Any],
+        endpoint: str,
+        data: Dict[str, Any],
+        rate_limit_args: Optional[None],
+    ) -> Union[bool, Dict[str, Any], List[Dict[str, Any]]]:
+        content = tuple(data.get(field) for field in _CONTENT_FIELDS)
+        message_key = self._message_key(data) if endpoint in _EDIT_ENDPOINTS else None
+        generation = None
+        if message_key is not None:
+            if endpoint != "editMessageMedia" and self._content.get(message_key) == content:
+                self.skipped_edits += 1
+                return True
+            generation = self._edit_generation.get(message_key, 0) + 1
+            self._edit_generation[message_key] = generation
+
+        chat_id = data.get("chat_id")
+        chat_bucket = self._chat_bucket(chat_id) if chat_id is not None else None
+        queued_at = time.monotonic()
+
+        try:
+            attempt = 0
+            while True:
+                if chat_bucket and endpoint.startswith(_SEND_PREFIXES):
+                    await chat_bucket.acquire()
+                elif chat_bucket:
+                    await chat_bucket.wait_pause()
+                await self._global.acquire()
+                if generation is not None and self._edit_generation.get(message_key) != generation:
+                    # Пока правка ждала очереди, пришла более новая правка того же сообщения
+                    self.coalesced_edits += 1
+                    return True
+                try:
+                    with tracing.span(f"telegram {endpoint}", attempt=attempt,
+                                      wait_ms=round((time.monotonic() - queued_at) * 1000, 1)):
+                        result = await callback(*args, **kwargs)
+                except RetryAfter as e:
+                    if attempt >= self.max_retries:
+                        raise
+                    delay = e.retry_after.total_seconds() if hasattr(e.retry_after, "total_seconds") else e.retry_after
+                    logger.warning(f"Flood control on {endpoint} (chat {chat_id}), retrying in {delay}s")
+                    (chat_bucket or self._global).pause(delay)
+                except BadRequest as e:
+                    if "message is not modified" in str(e).lower():
+                        self.skipped_edits += 1
+                        if message_key is not None:
+                            self._remember_content(message_key, content)
+                        return True
+                    raise
+                except NetworkError as e:
+                    if attempt >= self.max_retries or not endpoint.startswith(_IDEMPOTENT_PREFIXES):
+                        raise
+                    delay = BACKOFF_BASE * 2 ** attempt
+                    logger.warning(f"Network error on {endpoint}: {e}, retrying in {delay}s")
+                    await asyncio.sleep(delay)
+                else:
+                    break
+                attempt += 1
+                self.retries += 1
+        finally:
+            if generation is not None and self._edit_generation.get(message_key) == generation:
+                del self._edit_generation[message_key]
+
+        # Запомнить содержимое отправленного/отредактированного сообщения
+        if message_key is None and isinstance(result, dict) and "message_id" in result and chat_id is not None:
+            message_key = (chat_id, result["message_id"])
+        if endpoint == "editMessageMedia":
+            self._content.pop(message_key, None)
+        elif message_key is not None:
+            self._remember_content(message_key, content)
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        """Counters of skipped, coalesced and retried calls."""
+        return {
+            'skipped_edits': self.skipped_edits,
+            'coalesced_edits': self.coalesced_edits,
+            'retries': self.retries,
+        }
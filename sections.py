@@ -0,0 +1,234 @@
+"""Specs of the list sections served by handlers/sections.py.
+
+Every section of the bot is one entry here: the table, the fields asked
+in the add/edit dialogs, the statuses, the category, the rating flow,
+the video cache and the texts. database.py builds its queries and
+handlers/sections.py its handlers and keyboards from these specs.
+"""
+from models import (
+    SectionCategory, SectionField, SectionFilter, SectionMedia, SectionSpec, SectionStatus
+)
+
+_SKIP = "(или отправьте /skip чтобы пропустить)"
+_KEEP = "(или /skip чтобы оставить текущее)"
+
+_TITLE_EDIT = f"Введите новое название {_KEEP}:"
+_NOTE_EDIT = f"Введите новое примечание {_KEEP}:"
+
+MOVIES = SectionSpec(
+    key="movies",
+    name="movie",
+    prefix="movie",
+    table="movies",
+    emoji="🎬",
+    title="🎬 Раздел фильмов",
+    menu_button="🎬 Фильмы",
+    fields=(
+        SectionField("title", "Введите название фильма:", _TITLE_EDIT, required=True),
+        SectionField("note", f"Добавить примечание? {_SKIP}", _NOTE_EDIT, emoji="📝"),
+    ),
+    order_by="created_at DESC, id DESC",
+    status_column="watched",
+    statuses=(
+        SectionStatus(0, "📺 Ожидающие просмотра", key="pending",
+                      title="📺 Фильмы ожидающие просмотра", by_category=True),
+        SectionStatus(1, "✅ Просмотренные", key="watched", title="✅ Просмотренные фильмы"),
+    ),
+    done_status=1,
+    done_action="watched",
+    done_button="✅ Просмотрено",
+    category=SectionCategory(
+        column="category_id",
+        table="movie_categories",
+        filters=(
+            SectionFilter("films", "Фильм", "🎬 Фильмы"),
+            SectionFilter("series", "Сериал", "📺 Сериалы"),
+            SectionFilter("cartoons", "Мультик", "🎨 Мультики"),
+        ),
+    ),
+    rated=True,
+    top_title="🏆 Топ-10 фильмов",
+    random_button="🎲 Случайный фильм",
+    random_title="🎲 Случайный фильм:",
+    random_empty_text="Нет доступных фильмов",
+    random_exclude=("Сериал",),
+    add_button="➕ Добавить фильм",
+    choose_text="Выберите фильм:",
+    not_found_text="Фильм не найден",
+    added_text="✅ Фильм добавлен!",
+    updated_text="✅ Фильм обновлен!",
+    deleted_text="✅ Фильм удален!",
+    done_text="✅ Фильм отмечен как просмотренный!",
+    editable=True,
+    deletable=True,
+)
+
+ACTIVITIES = SectionSpec(
+    key="activities",
+    name="activity",
+    prefix="activity",
+    table="activities",
+    emoji="📋",
+    title="📋 Раздел активностей",
+    menu_button="📋 Активности",
+    fields=(
+        SectionField("title", "Введите название активности:", _TITLE_EDIT, required=True),
+        SectionField("note", f"Добавить примечание? {_SKIP}", _NOTE_EDIT, emoji="📝"),
+    ),
+    order_by="created_at DESC, id DESC",
+    statuses=(
+        SectionStatus("planned", "📝 Планируемые"),
+        SectionStatus("done", "✅ Выполненные"),
+    ),
+    done_status="done",
+    choose_text="Выберите активность:",
+    not_found_text="Активность не найдена",
+    added_text="✅ Активность добавлена!",
+    updated_text="✅ Активность обновлена!",
+    deleted_text="✅ Активность удалена!",
+    done_text="✅ Активность выполнена!",
+    editable=True,
+    deletable=True,
+)
+
+TRIPS = SectionSpec(
+    key="trips",
+    name="trip",
+    prefix="trip",
+    table="trips",
+    emoji="✈️",
+    title="✈️ Раздел поездок",
+    menu_button="✈️ Поездки",
+    fields=(
+        SectionField("title", "Введите название поездки:", _TITLE_EDIT, required=True),
+        SectionField("note", f"Добавить примечание? {_SKIP}", _NOTE_EDIT, emoji="📝"),
+    ),
+    order_by="created_at DESC, id DESC",
+    # Посещение - отметка на записи, отдельных списков по ней нет
+    status_column="visited",
+    done_status=1,
+    done_action="visited",
+    done_button="✅ Посещено",
+    category=SectionCategory(
+        column="category_id",
+        table="trip_categories",
+        filters=(
+            SectionFilter("walk", "Пешком", "🚶 Пешком"),
+            SectionFilter("trips", "Поездки", "🚗 Поездки"),
+            SectionFilter("places", "Места в Херцег-Нови", "📍 Места в Херцег-Нови"),
+        ),
+    ),
+    choose_text="Выберите поездку:",
+    not_found_text="Поездка не найдена",
+    added_text="✅ Поездка добавлена!",
+    updated_text="✅ Поездка обновлена!",
+    deleted_text="✅ Поездка удалена!",
+    done_text="✅ Поездка отмечена как посещенная!",
+    editable=True,
+    deletable=True,
+)
+
+TIKTOK = SectionSpec(
+    key="tiktok",
+    name="tiktok",
+    prefix="tiktok",
+    table="tiktok_trends",
+    emoji="📱",
+    title="📱 Раздел трендов TikTok",
+    menu_button="📱 Тренды TikTok",
+    fields=(
+        SectionField("title", "Введите название тренда:", required=True),
+        SectionField("video_file_id", "Приложите видео:", video=True),
+    ),
+    order_by="created_at DESC, id DESC",
+    statuses=(
+        SectionStatus("todo", "📝 Надо снять"),
+        SectionStatus("done", "✅ Снятые"),
+    ),
+    done_status="done",
+    media=SectionMedia(table="tiktok_media", item_column="trend_id"),
+    choose_text="Выберите тренд:",
+    not_found_text="Тренд не найден",
+    added_text="✅ Тренд добавлен!",
+    deleted_text="✅ Тренд удален!",
+    done_text="✅ Тренд отмечен как выполненный!",
+    deletable=True,
+)
+
+PHOTOS = SectionSpec(
+    key="photos",
+    name="photo",
+    prefix="photo_cat",
+    table="photo_categories",
+    emoji="📸",
+    title="📸 Раздел фотографий",
+    menu_button="📸 Фотографии",
+    fields=(
+        SectionField("title", "Введите название категории:", required=True),
+        SectionField("link", f"Добавить ссылку? {_SKIP}", emoji="🔗"),
+        SectionField("description", f"Добавить описание? {_SKIP}", emoji="📝"),
+    ),
+    order_by="id",
+    add_button="➕ Добавить категорию",
+    choose_text="Выберите категорию:",
+    empty_text="Список категорий пуст",
+    not_found_text="Категория не найдена",
+    added_text="✅ Категория добавлена!",
+)
+
+GAMES = SectionSpec(
+    key="games",
+    name="game",
+    prefix="game",
+    table="games",
+    emoji="🎮",
+    title="🎮 Раздел компьютерных игр",
+    menu_button="🎮 Игры",
+    fields=(
+        SectionField("title", "Введите название игры:", _TITLE_EDIT, required=True),
+        SectionField("note", f"Добавить примечание? {_SKIP}", _NOTE_EDIT, emoji="📝"),
+        SectionField("genre", f"Указать жанр? {_SKIP}",
+                     "Введите новый жанр (или /skip чтобы оставить текущий):", emoji="🏷️"),
+    ),
+    order_by="created_at DESC, id DESC",
+    statuses=(
+        SectionStatus("pending", "📋 Ожидающие",
+                      title="📝 Ожидающие игры\n\nВыберите список:", by_category=True),
+        SectionStatus("done", "✅ Пройденные", title="✅ Пройденные игры"),
+    ),
+    done_status="done",
+    done_button="✅ Пройдено",
+    # Жанр вводится текстом, категории - его различные значения
+    category=SectionCategory(column="genre"),
+    rated=True,
+    top_title="🏆 Топ-10 игр",
+    random_button="🎲 Случайная игра",
+    random_title="🎲 Случайная игра:",
+    random_empty_text="Нет доступных игр",
+    choose_text="Выберите игру:",
+    not_found_text="Игра не найдена",
+    added_text="✅ Игра добавлена!",
+    updated_text="✅ Игра обновлена!",
+    deleted_text="✅ Игра удалена!",
+    done_text="✅ Игра отмечена как пройденная!",
+    editable=True,
+    deletable=True,
+)
+
+SEXUAL = SectionSpec(
+    key="sexual",
+    name="sexual",
+    prefix="sexual",
+    table="sexual",
+    emoji="🔞",
+    title="🔞 Раздел Sexual",
+    menu_button="🔞 Sexual",
+    fields=(
+        SectionField("title", "Введите название:", required=True),
+        SectionField("link", f"Добавить ссылку? {_SKIP}", emoji="🔗"),
+        SectionField("description", f"Добавить описание? {_SKIP}", emoji="📝"),
+    ),
+)
+
+# Порядок - порядок кнопок главного меню
+SECTIONS = {spec.key: spec for spec in (MOVIES, ACTIVITIES, TRIPS, TIKTOK, PHOTOS, GAMES, SEXUAL)}
@@ -0,0 +1,218 @@
+"""Sampled per-update tracing with JSON-lines or OTLP/HTTP export."""
+import contextvars
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+import urllib.request
+from typing import Any, Dict, List, Optional
+
+from config import TRACE_SAMPLE_RATE, TRACE_FILE, TRACE_OTLP_URL
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "tg_forus_bot"
+# Сколько трасс отправлять в коллектор одним запросом
+EXPORT_BATCH = 50
+
+_current: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+class _Trace:
+    """Spans of one sampled update, exported together when the root span ends."""
+    __slots__ = ("trace_id", "spans")
+
+    def __init__(self):
+        self.trace_id = os.urandom(16).hex()
+        self.spans: List["Span"] = []
+
+class Span:
+    """A timed operation; use as a context manager."""
+    __slots__ = ("trace", "span_id", "parent_id", "name", "attributes", "start_ns", "end_ns", "error", "_token")
+
+    def __init__(self, trace: _Trace, name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    def set(self, key: str, value: Any):
+        """Set an attribute."""
+        self.attributes[key] = value
+
+    def __enter__(self) -> "Span":
+        self.start_ns = time.time_ns()
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end_ns = time.time_ns()
+        _current.reset(self._token)
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        # list.append потокобезопасен: дочерние спаны закрываются и в потоках БД
+        self.trace.spans.append(self)
+        if self.parent_id is None:
+            _exporter.submit(self.trace)
+        return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+class _NoopSpan:
+    """Returned when the update is not sampled; does nothing."""
+    __slots__ = ()
+
+    def set(self, key: str, value: Any):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NOOP = _NoopSpan()
+
+def start_trace(name: str, **attributes) -> Any:
+    """Root span of a new trace, or a no-op span if the trace is not sampled."""
+    if _sample_rate <= 0 or random.random() >= _sample_rate:
+        return _NOOP
+    return Span(_Trace(), name, None, attributes)
+
+def span(name: str, **attributes) -> Any:
+    """Child span of the current one; a no-op outside a sampled trace."""
+    parent = _current.get()
+    if parent is None:
+        return _NOOP
+    return Span(parent.trace, name, parent.span_id, attributes)
+
+def active() -> bool:
+    """Whether code runs inside a sampled trace."""
+    return _current.get() is not None
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+def _otlp_span(trace_id: str, span: Span) -> Dict[str, Any]:
+    result = {
+        "traceId": trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 1,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in span.attributes.items()],
+        "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+    }
+    if span.parent_id:
+        result["parentSpanId"] = span.parent_id
+    return result
+
+class _Exporter:
+    """Writes finished traces from a background thread, off the event loop."""
+
+    def __init__(self):
+        self.path: Optional[str] = None
+        self.otlp_url: Optional[str] = None
+        self.exported = 0
+        self.dropped = 0
+        self._queue: "queue.SimpleQueue[Optional[_Trace]]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, trace: _Trace):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="trace-export", daemon=True)
+                    self._thread.start()
+        self._queue.put(trace)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < EXPORT_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            traces = [trace for trace in batch if trace is not None]
+            if traces:
+                try:
+                    self._export(traces)
+                    self.exported += len(traces)
+                except Exception:
+                    self.dropped += len(traces)
+                    logger.exception(f"Failed to export {len(traces)} trace(s)")
+            if stop:
+                return
+
+    def _export(self, traces: List[_Trace]):
+        if self.path:
+            with open(self.path, "a", encoding="utf-8") as f:
+                for trace in traces:
+                    record = {"trace_id": trace.trace_id, "spans": [s.to_dict() for s in trace.spans]}
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        if self.otlp_url:
+            payload = {"resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+                "scopeSpans": [{
+                    "scope": {"name": __name__},
+                    "spans": [_otlp_span(trace.trace_id, s) for trace in traces for s in trace.spans],
+                }],
+            }]}
+            request = urllib.request.Request(
+                self.otlp_url, data=json.dumps(payload).encode(), method="POST",
+                headers={"Content-Type": "application/json"}
+            )
+            with urllib.request.urlopen(request, timeout=5):
+                pass
+
+    def shutdown(self, timeout: float = 5):
+        """Write queued traces and stop the thread."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+_exporter = _Exporter()
+_sample_rate = 0.0
+
+def configure(sample_rate: float = TRACE_SAMPLE_RATE, path: Optional[str] = TRACE_FILE,
+              otlp_url: Optional[str] = TRACE_OTLP_URL):
+    """Set the share of traced updates (0 disables tracing) and where traces go."""
+    global _sample_rate
+    _sample_rate = min(max(sample_rate, 0.0), 1.0)
+    _exporter.path = path or None
+    _exporter.otlp_url = otlp_url or None
+    if _sample_rate and not (_exporter.path or _exporter.otlp_url):
+        logger.warning("Tracing is enabled but has no exporter, traces are discarded")
+        _sample_rate = 0.0
+    if _sample_rate:
+        logger.info(f"Tracing {_sample_rate:.0%} of updates")
+
+def shutdown():
+    """Flush pending traces (called on shutdown)."""
+    _exporter.shutdown()
+
+configure()
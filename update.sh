@@ -22,12 +22,16 @@ if [ $? -ne 0 ]; then
 fi
 echo
 
-echo "[2/3] Остановка контейнера..."
-docker compose down
+# Сборка до остановки: старый контейнер работает, пока собирается новый образ
+echo "[2/3] Пересборка образа..."
+docker compose build
+if [ $? -ne 0 ]; then
+    echo "ОШИБКА: Не удалось собрать образ"
+    exit 1
+fi
 echo
 
-echo "[3/3] Пересборка и запуск..."
-docker compose build
+echo "[3/3] Перезапуск контейнера..."
 docker compose up -d
 if [ $? -ne 0 ]; then
     echo "ОШИБКА: Не удалось запустить контейнер"
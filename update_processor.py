@@ -0,0 +1,70 @@
+"""Concurrent update processing that keeps updates of one chat in order."""
+import asyncio
+from typing import Any, Awaitable, Dict, Optional
+
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+import tracing
+from metrics import metrics, update_type, UPDATE_DURATION
+
+def _chat_key(update: object) -> Optional[int]:
+    """Serialization key: the chat, or the user for updates without a chat."""
+    if not isinstance(update, Update):
+        return None
+    if update.effective_chat:
+        return update.effective_chat.id
+    if update.effective_user:
+        return update.effective_user.id
+    return None
+
+class ChatUpdateProcessor(BaseUpdateProcessor):
+    """Processes updates of different chats in parallel, of one chat in order.
+
+    Updates sharing a chat wait for each other, so ConversationHandler
+    state and ``context.user_data`` never see two updates of the same
+    conversation at once. At most ``max_running`` updates execute at the
+    same time. The limit is taken only after the chat's turn comes, so
+    updates queued behind a slow one do not occupy slots other chats
+    could use. ``max_pending`` (the PTB semaphore) bounds how many
+    updates may wait in total.
+    """
+
+    def __init__(self, max_running: int = 8, max_pending: int = 256):
+        super().__init__(max_pending)
+        if max_running < 1:
+            raise ValueError("max_running must be a positive integer")
+        self.max_running = max_running
+        self._running = asyncio.BoundedSemaphore(max_running)
+        self._locks: Dict[int, asyncio.Lock] = {}
+        self._waiting: Dict[int, int] = {}
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        key = _chat_key(update)
+        kind = update_type(update)
+        timer = metrics.timer(UPDATE_DURATION, kind)
+        if key is None:
+            async with self._running:
+                with timer, tracing.start_trace(f"update {kind}"):
+                    await coroutine
+            return
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._waiting[key] = self._waiting.get(key, 0) + 1
+        try:
+            # asyncio.Lock пропускает ожидающих в порядке очереди - порядок обновлений сохраняется
+            async with lock:
+                async with self._running:
+                    with timer, tracing.start_trace(f"update {kind}", chat_id=key, queued=self._waiting[key] - 1):
+                        await coroutine
+        finally:
+            self._waiting[key] -= 1
+            if not self._waiting[key]:
+                del self._waiting[key]
+                del self._locks[key]
+
+    async def initialize(self) -> None:
+        """Nothing to set up."""
+
+    async def shutdown(self) -> None:
+        """Nothing to release; Application.stop() already waited for running updates."""
@@ -0,0 +1,100 @@
+"""Webhook mode: a small aiohttp server feeding updates into the Application."""
+import asyncio
+import hmac
+import json
+import logging
+import signal
+from typing import List, Optional
+
+from aiohttp import web
+from telegram import Update
+from telegram.ext import Application
+
+logger = logging.getLogger(__name__)
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+# Сколько секунд ждать завершения активных HTTP-запросов при остановке
+SHUTDOWN_TIMEOUT = 10
+
+def build_web_app(application: Application, path: str, secret: str) -> web.Application:
+    """aiohttp app with the update endpoint and /health."""
+    web_app = web.Application()
+    web_app['draining'] = False
+
+    async def receive_update(request: web.Request) -> web.Response:
+        if not hmac.compare_digest(request.headers.get(SECRET_HEADER, ""), secret):
+            return web.Response(status=403)
+        if web_app['draining']:
+            # Telegram повторит доставку после перезапуска
+            return web.Response(status=503)
+        try:
+            data = await request.json()
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return web.Response(status=400)
+        update = Update.de_json(data, application.bot)
+        if update is None:
+            return web.Response(status=400)
+        await application.update_queue.put(update)
+        return web.Response()
+
+    async def health(request: web.Request) -> web.Response:
+        healthy = application.running and not web_app['draining']
+        return web.json_response(
+            {
+                "status": "ok" if healthy else "draining",
+                "pending_updates": application.update_queue.qsize(),
+            },
+            status=200 if healthy else 503
+        )
+
+    web_app.router.add_post(path, receive_update)
+    web_app.router.add_get("/health", health)
+    return web_app
+
+async def run_webhook(application: Application, listen: str, port: int, path: str,
+                      secret: str, url: str = "", allowed_updates: Optional[List[str]] = None):
+    """Serve webhook updates until SIGTERM/SIGINT, then drain and shut down.
+
+    On shutdown the server stops accepting updates, already queued updates
+    are processed and the webhook stays registered, so Telegram keeps new
+    updates until the next start.
+    """
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    web_app = build_web_app(application, path, secret)
+    runner = web.AppRunner(web_app, shutdown_timeout=SHUTDOWN_TIMEOUT, access_log=None)
+
+    await application.initialize()
+    if application.post_init:
+        await application.post_init(application)
+    try:
+        await application.start()
+        await runner.setup()
+        await web.TCPSite(runner, listen, port).start()
+        if url:
+            await application.bot.set_webhook(
+                url=url, secret_token=secret, allowed_updates=allowed_updates
+            )
+            logger.info(f"Webhook registered at {url}")
+        else:
+            logger.warning("WEBHOOK_URL is empty, webhook is not registered in Telegram")
+        logger.info(f"Listening for updates on {listen}:{port}{path}")
+
+        await stop.wait()
+
+        logger.info("Stopping: draining pending updates")
+    finally:
+        web_app['draining'] = True
+        await runner.cleanup()
+        # stop() обрабатывает всё, что уже лежит в update_queue
+        if application.running:
+            await application.stop()
+        await application.shutdown()
+        if application.post_shutdown:
+            await application.post_shutdown(application)
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.remove_signal_handler(sig)